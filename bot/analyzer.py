@@ -5,27 +5,131 @@ Performs comprehensive analysis of X accounts
 
 import logging
 import re
-from datetime import datetime, timedelta
+from collections import Counter
+from operator import itemgetter
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
-from textblob import TextBlob
-import statistics
+
+from .monitor import XMonitor
+from .sentiment import polarity
 
 logger = logging.getLogger(__name__)
 
+# Detects links or domain-like text in bios
+_LINK_RE = re.compile(r'https?://|www\.|\.[a-z]{2,}')
+
+# Risk points added for categorical analysis results
+BIO_RISK_WEIGHTS = {'high': 20, 'medium': 10}
+ENGAGEMENT_RISK_WEIGHTS = {'minimal_engagement': 10, 'high_engagement': -5}
+
+def _risk_score(is_new: bool, ratio_suspicious: bool, bio_weight: float, suspicious_ratio: float,
+                engagement_weight: float, consistent_activity: bool, verified: bool) -> float:
+    """Combine pre-extracted risk factors into a score clamped to 0-100"""
+    risk_score = (
+        25 * is_new                        # Account age factor
+        + 20 * ratio_suspicious            # Follower ratio factor
+        + bio_weight                       # Bio analysis factor
+        + 15 * suspicious_ratio            # Content analysis factor
+        + engagement_weight                # Engagement pattern factor
+        + 10 * (not consistent_activity)   # Activity pattern factor
+        - 15 * verified                    # Verification reduces risk
+    )
+    return round(max(0, min(100, risk_score)), 1)
+
+# Topic labels reported for each keyword category, in report order
+TOPIC_CATEGORIES = (
+    ('crypto', 'cryptocurrency'),
+    ('finance', 'finance'),
+    ('tech', 'technology')
+)
+
+def _compile_keyword_scanner(categories: Dict[str, tuple]):
+    """
+    Compile categorized keyword lists into a single-pass scanner
+    
+    Args:
+        categories: Mapping of category name to keyword tuple
+    
+    Returns:
+        Tuple of (pattern, hits). The pattern matches the longest keyword
+        starting at every position; hits maps each keyword to the
+        (category, keyword) pairs it implies, including shorter keywords
+        that are prefixes of it, so results match plain substring checks.
+    """
+    keyword_categories = {}
+    for category, keywords in categories.items():
+        for kw in keywords:
+            keyword_categories.setdefault(kw.lower(), []).append(category)
+    
+    ordered = sorted(keyword_categories, key=len, reverse=True)
+    pattern = re.compile('(?=(%s))' % '|'.join(re.escape(kw) for kw in ordered))
+    hits = {
+        kw: tuple(
+            (category, prefix)
+            for prefix in ordered if kw.startswith(prefix)
+            for category in keyword_categories[prefix]
+        )
+        for kw in ordered
+    }
+    return pattern, hits
+
+# Keyword lists are module-level tuples so they are built once and shared read-only
+# across analyzer instances and threads; tuple order is the order keywords are reported in
+SUSPICIOUS_KEYWORDS = (
+    'pump', 'moon', 'lambo', 'diamond hands', 'hodl', 'ape',
+    'guaranteed', 'returns', 'investment opportunity', 'exclusive',
+    'limited time', 'act now', 'don\'t miss out', 'financial advice'
+)
+POSITIVE_KEYWORDS = (
+    'research', 'analysis', 'education', 'community', 'development',
+    'building', 'learning', 'discussing', 'sharing', 'helping'
+)
+CRYPTO_KEYWORDS = ('bitcoin', 'ethereum', 'crypto', 'blockchain', 'defi', 'nft', 'solana', 'token')
+FINANCE_KEYWORDS = ('trading', 'investment', 'market', 'price', 'profit', 'loss', 'portfolio')
+TECH_KEYWORDS = ('development', 'coding', 'programming', 'software', 'app', 'web3')
+
+KEYWORD_CATEGORIES = {
+    'suspicious': SUSPICIOUS_KEYWORDS,
+    'positive': POSITIVE_KEYWORDS,
+    'crypto': CRYPTO_KEYWORDS,
+    'finance': FINANCE_KEYWORDS,
+    'tech': TECH_KEYWORDS
+}
+
+# One scanner covers every keyword list so each text is walked once
+_KEYWORD_RE, _KEYWORD_HITS = _compile_keyword_scanner(KEYWORD_CATEGORIES)
+
+# Category bitmask implied by each keyword match, for scans that only need categories
+_CATEGORY_BITS = {category: 1 << i for i, category in enumerate(KEYWORD_CATEGORIES)}
+_KEYWORD_MASKS = {
+    kw: sum({_CATEGORY_BITS[category] for category, _ in hits})
+    for kw, hits in _KEYWORD_HITS.items()
+}
+
 class AccountAnalyzer:
     """Analyzes X accounts for trustworthiness indicators"""
     
-    def __init__(self, config):
+    def __init__(self, config, monitor: Optional[XMonitor] = None):
         self.config = config
-        self.suspicious_keywords = [
-            'pump', 'moon', 'lambo', 'diamond hands', 'hodl', 'ape',
-            'guaranteed', 'returns', 'investment opportunity', 'exclusive',
-            'limited time', 'act now', 'don\'t miss out', 'financial advice'
-        ]
-        self.positive_keywords = [
-            'research', 'analysis', 'education', 'community', 'development',
-            'building', 'learning', 'discussing', 'sharing', 'helping'
-        ]
+        # Reuse the caller's monitor so API clients are set up once, not per analysis
+        self.monitor = monitor or XMonitor(config)
+        self.suspicious_keywords = SUSPICIOUS_KEYWORDS
+        self.positive_keywords = POSITIVE_KEYWORDS
+    
+    def _scan_keywords(self, text_lower: str) -> Dict[str, set]:
+        """Find all tracked keywords in lowercased text, grouped by category"""
+        found = {}
+        for match in _KEYWORD_RE.finditer(text_lower):
+            for category, kw in _KEYWORD_HITS[match.group(1)]:
+                found.setdefault(category, set()).add(kw)
+        return found
+    
+    def _scan_categories(self, text_lower: str) -> int:
+        """Get a bitmask of the keyword categories present in lowercased text"""
+        mask = 0
+        for match in _KEYWORD_RE.finditer(text_lower):
+            mask |= _KEYWORD_MASKS[match.group(1)]
+        return mask
     
     def analyze_account(self, user_id: str) -> Optional[Dict]:
         """
@@ -38,17 +142,14 @@ class AccountAnalyzer:
             Dictionary with analysis results or None if error
         """
         try:
-            from .monitor import XMonitor
-            monitor = XMonitor(self.config)
-            
             # Get user information
-            user_info = monitor.get_user_info(user_id)
+            user_info = self.monitor.get_user_info(user_id)
             if not user_info:
                 logger.error(f"Could not retrieve user info for {user_id}")
                 return None
             
             # Get user tweets
-            user_tweets = monitor.get_user_tweets(user_id, self.config.MAX_RECENT_TWEETS)
+            user_tweets = self.monitor.get_user_tweets(user_id, self.config.MAX_RECENT_TWEETS)
             
             # Perform analysis
             analysis = {
@@ -84,9 +185,8 @@ class AccountAnalyzer:
     def _calculate_account_age(self, created_at: datetime) -> Dict:
         """Calculate account age and related metrics"""
         try:
-            now = datetime.now()
-            if created_at.tzinfo:
-                created_at = created_at.replace(tzinfo=None)
+            # X API timestamps are UTC-aware, so compare against aware UTC now
+            now = datetime.now(timezone.utc)
             
             age_delta = now - created_at
             age_days = age_delta.days
@@ -152,12 +252,13 @@ class AccountAnalyzer:
             
             bio_lower = bio.lower()
             
-            # Check for suspicious keywords
-            found_suspicious = [kw for kw in self.suspicious_keywords if kw in bio_lower]
-            found_positive = [kw for kw in self.positive_keywords if kw in bio_lower]
+            # Check for suspicious and positive keywords in one pass
+            found = self._scan_keywords(bio_lower)
+            found_suspicious = [kw for kw in self.suspicious_keywords if kw in found.get('suspicious', ())]
+            found_positive = [kw for kw in self.positive_keywords if kw in found.get('positive', ())]
             
             # Check for links
-            contains_links = bool(re.search(r'http[s]?://|www\.|\.[a-z]{2,}', bio))
+            contains_links = bool(_LINK_RE.search(bio))
             
             # Determine risk level
             risk_level = 'low'
@@ -194,17 +295,22 @@ class AccountAnalyzer:
                     'pattern': 'no_data'
                 }
             
-            likes = [t['like_count'] for t in tweets]
-            retweets = [t['retweet_count'] for t in tweets]
-            replies = [t['reply_count'] for t in tweets]
+            # Accumulate all three totals in a single pass, without intermediate lists
+            total_likes = total_retweets = total_replies = 0
+            for t in tweets:
+                total_likes += t['like_count']
+                total_retweets += t['retweet_count']
+                total_replies += t['reply_count']
             
-            avg_likes = statistics.mean(likes) if likes else 0
-            avg_retweets = statistics.mean(retweets) if retweets else 0
-            avg_replies = statistics.mean(replies) if replies else 0
+            # Plain float division; counts don't need statistics.mean's exact arithmetic
+            tweet_count = len(tweets)
+            avg_likes = total_likes / tweet_count
+            avg_retweets = total_retweets / tweet_count
+            avg_replies = total_replies / tweet_count
             
             # Calculate engagement rate (simplified)
-            total_engagement = sum(likes) + sum(retweets) + sum(replies)
-            engagement_rate = total_engagement / len(tweets) if tweets else 0
+            total_engagement = total_likes + total_retweets + total_replies
+            engagement_rate = total_engagement / tweet_count
             
             # Determine engagement pattern
             pattern = self._classify_engagement_pattern(avg_likes, avg_retweets, avg_replies)
@@ -245,12 +351,24 @@ class AccountAnalyzer:
                     'suspicious_content_count': 0
                 }
             
-            # Combine all tweet text
-            all_text = ' '.join([t['text'] for t in tweets])
+            # Score sentiment and scan keywords per tweet in a single pass,
+            # instead of building one large joined string
+            sentiment_total = 0.0
+            suspicious_count = 0
+            matched_categories = 0
+            suspicious_bit = _CATEGORY_BITS['suspicious']
+            for tweet in tweets:
+                text = tweet['text']
+                sentiment_total += polarity(text)
+                
+                # One scan feeds both the suspicious count and topic extraction
+                categories = self._scan_categories(text.lower())
+                if categories & suspicious_bit:
+                    suspicious_count += 1
+                matched_categories |= categories
             
-            # Sentiment analysis
-            blob = TextBlob(all_text)
-            sentiment_score = blob.sentiment.polarity
+            # Sentiment analysis (mean per-tweet polarity)
+            sentiment_score = sentiment_total / len(tweets)
             
             if sentiment_score > 0.1:
                 sentiment_label = 'positive'
@@ -260,20 +378,10 @@ class AccountAnalyzer:
                 sentiment_label = 'neutral'
             
             # Language distribution
-            languages = [t.get('lang', 'unknown') for t in tweets]
-            lang_dist = {}
-            for lang in languages:
-                lang_dist[lang] = lang_dist.get(lang, 0) + 1
-            
-            # Check for suspicious content
-            suspicious_count = 0
-            for tweet in tweets:
-                text_lower = tweet['text'].lower()
-                if any(kw in text_lower for kw in self.suspicious_keywords):
-                    suspicious_count += 1
+            lang_dist = dict(Counter(t.get('lang', 'unknown') for t in tweets))
             
             # Extract common topics (simplified)
-            topics = self._extract_topics(all_text)
+            topics = self._extract_topics(matched_categories)
             
             return {
                 'sentiment_score': round(sentiment_score, 3),
@@ -288,29 +396,9 @@ class AccountAnalyzer:
             logger.error(f"Error analyzing content: {str(e)}")
             return {'sentiment_score': 0, 'sentiment_label': 'neutral', 'topics': [], 'language_distribution': {}, 'suspicious_content_count': 0}
     
-    def _extract_topics(self, text: str) -> List[str]:
-        """Extract common topics from text (simplified approach)"""
-        try:
-            # Simple keyword-based topic extraction
-            crypto_keywords = ['bitcoin', 'ethereum', 'crypto', 'blockchain', 'defi', 'nft', 'solana', 'token']
-            finance_keywords = ['trading', 'investment', 'market', 'price', 'profit', 'loss', 'portfolio']
-            tech_keywords = ['development', 'coding', 'programming', 'software', 'app', 'web3']
-            
-            text_lower = text.lower()
-            topics = []
-            
-            if any(kw in text_lower for kw in crypto_keywords):
-                topics.append('cryptocurrency')
-            if any(kw in text_lower for kw in finance_keywords):
-                topics.append('finance')
-            if any(kw in text_lower for kw in tech_keywords):
-                topics.append('technology')
-            
-            return topics
-            
-        except Exception as e:
-            logger.error(f"Error extracting topics: {str(e)}")
-            return []
+    def _extract_topics(self, categories: int) -> List[str]:
+        """Map a matched keyword category bitmask to topic labels (simplified approach)"""
+        return [topic for category, topic in TOPIC_CATEGORIES if categories & _CATEGORY_BITS[category]]
     
     def _analyze_activity_patterns(self, tweets: List[Dict]) -> Dict:
         """Analyze posting activity patterns"""
@@ -322,28 +410,21 @@ class AccountAnalyzer:
                     'consistent_activity': False
                 }
             
-            # Sort tweets by date
-            sorted_tweets = sorted(tweets, key=lambda x: x['created_at'], reverse=True)
-            
             # Check recent activity (last 7 days)
-            now = datetime.now()
+            now = datetime.now(timezone.utc)
             recent_cutoff = now - timedelta(days=7)
             
-            recent_tweets = []
-            for tweet in sorted_tweets:
-                tweet_time = tweet['created_at']
-                if tweet_time.tzinfo:
-                    tweet_time = tweet_time.replace(tzinfo=None)
-                if tweet_time > recent_cutoff:
-                    recent_tweets.append(tweet)
+            recent_tweets_count = 0
+            for tweet in tweets:
+                if tweet['created_at'] > recent_cutoff:
+                    recent_tweets_count += 1
             
-            recent_activity = len(recent_tweets) > 0
+            recent_activity = recent_tweets_count > 0
             
             # Determine posting frequency
             if len(tweets) >= 20:
-                oldest_tweet = sorted_tweets[-1]['created_at']
-                if oldest_tweet.tzinfo:
-                    oldest_tweet = oldest_tweet.replace(tzinfo=None)
+                # Only the oldest timestamp is needed, so a linear min beats sorting
+                oldest_tweet = min(tweets, key=itemgetter('created_at'))['created_at']
                 days_span = (now - oldest_tweet).days
                 if days_span > 0:
                     tweets_per_day = len(tweets) / days_span
@@ -363,7 +444,7 @@ class AccountAnalyzer:
             return {
                 'posting_frequency': frequency,
                 'recent_activity': recent_activity,
-                'recent_tweets_count': len(recent_tweets),
+                'recent_tweets_count': recent_tweets_count,
                 'consistent_activity': frequency in ['moderate', 'high']
             }
             
@@ -374,46 +455,15 @@ class AccountAnalyzer:
     def _calculate_risk_score(self, analysis: Dict) -> float:
         """Calculate overall risk score (0-100, higher = more risky)"""
         try:
-            risk_score = 0
-            
-            # Account age factor
-            if analysis['account_age']['is_new']:
-                risk_score += 25
-            
-            # Follower ratio factor
-            if analysis['follower_following_ratio']['is_suspicious']:
-                risk_score += 20
-            
-            # Bio analysis factor
-            bio_risk = analysis['bio_analysis']['risk_level']
-            if bio_risk == 'high':
-                risk_score += 20
-            elif bio_risk == 'medium':
-                risk_score += 10
-            
-            # Content analysis factor
-            suspicious_ratio = analysis['content_analysis']['suspicious_content_ratio']
-            risk_score += suspicious_ratio * 15
-            
-            # Engagement pattern factor
-            engagement_pattern = analysis['engagement_analysis']['pattern']
-            if engagement_pattern == 'minimal_engagement':
-                risk_score += 10
-            elif engagement_pattern == 'high_engagement':
-                risk_score -= 5  # Subtract for good engagement
-            
-            # Activity pattern factor
-            if not analysis['activity_patterns']['consistent_activity']:
-                risk_score += 10
-            
-            # Verification status (reduce risk if verified)
-            if analysis['verification_status']:
-                risk_score -= 15
-            
-            # Ensure score is within bounds
-            risk_score = max(0, min(100, risk_score))
-            
-            return round(risk_score, 1)
+            return _risk_score(
+                bool(analysis['account_age']['is_new']),
+                bool(analysis['follower_following_ratio']['is_suspicious']),
+                BIO_RISK_WEIGHTS.get(analysis['bio_analysis']['risk_level'], 0),
+                analysis['content_analysis']['suspicious_content_ratio'],
+                ENGAGEMENT_RISK_WEIGHTS.get(analysis['engagement_analysis']['pattern'], 0),
+                bool(analysis['activity_patterns']['consistent_activity']),
+                bool(analysis['verification_status'])
+            )
             
         except Exception as e:
             logger.error(f"Error calculating risk score: {str(e)}")
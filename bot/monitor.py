@@ -6,12 +6,32 @@ Handles monitoring of X replies and trigger detection
 import tweepy
 import logging
 import re
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 
+from .utils import DataCache, generate_cache_key, load_json_file, save_json_file
+
 logger = logging.getLogger(__name__)
 
+# Mention variations (@projectruggaurd vs @projectrugguard) accepted alongside the configured phrase
+TRIGGER_PHRASE_VARIANTS = (
+    '@projectruggaurd riddle me this',
+    '@projectrugguard riddle me this'
+)
+
+# Fields requested for trigger tweets by both search and the filtered stream
+TRIGGER_TWEET_FIELDS = ['created_at', 'author_id', 'in_reply_to_user_id', 'referenced_tweets']
+TRIGGER_EXPANSIONS = ['author_id', 'in_reply_to_user_id', 'referenced_tweets.id']
+
+# Marks a cache miss, since None is itself a cacheable lookup result
+_MISSING = object()
+
+# Returned by a fetch that failed, as opposed to one the API answered with no data
+_FAILED = object()
+
 class XMonitor:
     """Monitors X for trigger phrases and manages API interactions"""
     
@@ -21,8 +41,18 @@ class XMonitor:
         self.api_v2 = None
         self.client = None
         self.last_checked = datetime.now() - timedelta(minutes=5)
-        self.processed_tweets = set()
+        self.last_tweet_id = None
+        self._retry_floor = None  # since_id that re-fetches the oldest trigger still to be answered
+        self._trigger_attempts = {}  # Trigger tweet ID -> failed attempts so far
+        self.processed_tweets = OrderedDict()  # Insertion-ordered so the oldest IDs are evicted first
+        self.user_cache = DataCache(default_ttl=config.USER_CACHE_TTL)
+        self.cache_lock = threading.Lock()
+        
+        # Match every accepted trigger phrase in one case-insensitive scan
+        trigger_phrases = dict.fromkeys((*TRIGGER_PHRASE_VARIANTS, config.TRIGGER_PHRASE.lower()))
+        self.trigger_re = re.compile('|'.join(re.escape(phrase) for phrase in trigger_phrases), re.IGNORECASE)
         
+        self._load_state()
         self._initialize_api()
     
     def _initialize_api(self):
@@ -62,50 +92,164 @@ class XMonitor:
         Returns:
             List of trigger events with tweet IDs and original author info
         """
-        triggers = []
+        return list(self.iter_triggers())
+    
+    def iter_triggers(self):
+        """
+        Yield new trigger events as each page of search results arrives
+        
+        Pages are fetched lazily, so callers can start processing the first
+        triggers before later pages have been requested.
         
+        Yields:
+            Trigger event dictionaries with tweet IDs and original author info
+        """
+        for triggers in self.iter_trigger_pages():
+            yield from triggers
+    
+    def iter_trigger_pages(self):
+        """
+        Yield the new trigger events found on each page of search results
+        
+        Yields:
+            Non-empty lists of trigger event dictionaries, one list per page
+        """
         try:
-            # Search for recent tweets containing the trigger phrase
-            # Handle mention-based trigger phrase properly
-            if self.config.TRIGGER_PHRASE.startswith('@'):
-                # For mention-based triggers, search for the phrase without quotes
-                query = f'{self.config.TRIGGER_PHRASE} -is:retweet'
-            else:
-                query = f'"{self.config.TRIGGER_PHRASE}" -is:retweet'
+            # Step back to the oldest trigger awaiting a retry, so this poll fetches it again
+            since_id = self._get_last_tweet_id()
+            self.last_tweet_id = since_id
+            self._retry_floor = None
             
-            # If monitoring specific account, add it to query
-            if self.config.MONITORED_ACCOUNT:
-                query += f" to:{self.config.MONITORED_ACCOUNT}"
-            
-            # Search for tweets
-            tweets = self.client.search_recent_tweets(
-                query=query,
-                max_results=10,
-                tweet_fields=['created_at', 'author_id', 'in_reply_to_user_id', 'referenced_tweets'],
-                expansions=['author_id', 'in_reply_to_user_id', 'referenced_tweets.id'],
-                since_id=self._get_last_tweet_id()
+            # Search for tweets, following pagination up to the configured page limit
+            pages = tweepy.Paginator(
+                self.client.search_recent_tweets,
+                query=self._build_query(),
+                max_results=100,
+                tweet_fields=TRIGGER_TWEET_FIELDS,
+                expansions=TRIGGER_EXPANSIONS,
+                since_id=since_id,
+                limit=self.config.MAX_SEARCH_PAGES
             )
             
-            if not tweets.data:
-                return triggers
-            
-            for tweet in tweets.data:
-                if tweet.id in self.processed_tweets:
-                    continue
-                
-                # Check if this is a reply and contains exact trigger phrase
-                if self._is_valid_trigger(tweet):
-                    trigger_info = self._extract_trigger_info(tweet, tweets.includes)
-                    if trigger_info:
-                        triggers.append(trigger_info)
-                        self.processed_tweets.add(tweet.id)
+            for page in pages:
+                if page.data:
+                    triggers = list(self._collect_triggers(page.data, page.includes))
+                    if triggers:
+                        yield triggers
             
+            # The new position is only persisted by save_state(), once these triggers are handled
             self.last_checked = datetime.now()
             
+            with self.cache_lock:
+                self.user_cache.clear_expired()
+            
         except Exception as e:
             logger.error(f"Error checking for triggers: {str(e)}")
+    
+    def stream_triggers(self, on_trigger):
+        """
+        Deliver trigger events as they are posted, via the filtered stream
+        
+        Blocks until the stream disconnects or fails; callers should fall back
+        to polling with iter_triggers() afterwards.
+        
+        Args:
+            on_trigger: Callable invoked with each trigger event dictionary
+        """
+        monitor = self
+        
+        class TriggerStream(tweepy.StreamingClient):
+            def on_response(self, response):
+                if response.data:
+                    for trigger_info in monitor._collect_triggers([response.data], response.includes):
+                        on_trigger(trigger_info)
+            
+            def on_errors(self, errors):
+                logger.error(f"Filtered stream errors: {errors}")
+        
+        stream = TriggerStream(self.config.X_BEARER_TOKEN, wait_on_rate_limit=True)
+        
+        # Replace any previous rules with the trigger query
+        existing = stream.get_rules()
+        if existing.data:
+            stream.delete_rules([rule.id for rule in existing.data])
+        stream.add_rules(tweepy.StreamRule(self._build_query(), tag='rugguard-trigger'))
+        
+        logger.info("Listening for triggers on the filtered stream")
+        stream.filter(tweet_fields=TRIGGER_TWEET_FIELDS, expansions=TRIGGER_EXPANSIONS)
+    
+    def _build_query(self) -> str:
+        """Build the search/stream query for the trigger phrase"""
+        # Handle mention-based trigger phrase properly
+        if self.config.TRIGGER_PHRASE.startswith('@'):
+            # For mention-based triggers, search for the phrase without quotes
+            query = f'{self.config.TRIGGER_PHRASE} -is:retweet'
+        else:
+            query = f'"{self.config.TRIGGER_PHRASE}" -is:retweet'
+        
+        # If monitoring specific account, add it to query
+        if self.config.MONITORED_ACCOUNT:
+            query += f" to:{self.config.MONITORED_ACCOUNT}"
+        
+        return query
+    
+    def _collect_triggers(self, tweets, includes):
+        """
+        Yield trigger events for new, valid trigger tweets
+        
+        Args:
+            tweets: Candidate tweets from a search page or stream event
+            includes: Expansions returned alongside the tweets
+        
+        Yields:
+            Trigger event dictionaries
+        """
+        # Resolve all replied-to tweets up front instead of one lookup per trigger
+        original_tweets = self._get_original_tweets(tweets, includes)
+        
+        for tweet in tweets:
+            if self.last_tweet_id is None or tweet.id > self.last_tweet_id:
+                self.last_tweet_id = tweet.id
+            
+            if tweet.id in self.processed_tweets:
+                continue
+            
+            # Check if this is a reply and contains exact trigger phrase
+            if self._is_valid_trigger(tweet):
+                trigger_info = self._extract_trigger_info(tweet, original_tweets)
+                if trigger_info:
+                    self._mark_processed(tweet.id)
+                    yield trigger_info
+                else:
+                    # Usually a failed lookup of the original tweet; try again next poll
+                    self.trigger_finished(tweet.id, False)
+    
+    def trigger_finished(self, tweet_id: int, answered: bool):
+        """
+        Record a trigger's outcome, holding the saved position back until it is answered
+        
+        A trigger that failed or could not be resolved is fetched again by the next
+        polls, up to MAX_TRIGGER_RETRIES times, then dropped with a warning.
+        
+        Args:
+            tweet_id: ID of the trigger tweet
+            answered: Whether a reply was posted and recorded
+        """
+        if answered:
+            self._trigger_attempts.pop(tweet_id, None)
+            return
         
-        return triggers
+        attempts = self._trigger_attempts.get(tweet_id, 0) + 1
+        if attempts > self.config.MAX_TRIGGER_RETRIES:
+            del self._trigger_attempts[tweet_id]
+            self._mark_processed(tweet_id)  # Skipped if a later retry window fetches it again
+            logger.warning("Giving up on trigger tweet %s after %d attempts", tweet_id, attempts)
+            return
+        
+        self._trigger_attempts[tweet_id] = attempts
+        self.processed_tweets.pop(tweet_id, None)
+        if self._retry_floor is None or tweet_id - 1 < self._retry_floor:
+            self._retry_floor = tweet_id - 1  # since_id is exclusive
     
     def _is_valid_trigger(self, tweet) -> bool:
         """Check if tweet is a valid trigger"""
@@ -114,50 +258,74 @@ class XMonitor:
             return False
         
         # Must contain exact trigger phrase (case insensitive)
-        tweet_text = tweet.text.lower()
-        trigger_phrase = self.config.TRIGGER_PHRASE.lower()
-        
-        # Handle mention variations (@projectruggaurd vs @projectrugguard)
-        if '@projectruggaurd riddle me this' in tweet_text or '@projectrugguard riddle me this' in tweet_text:
-            pass  # Valid trigger found
-        elif trigger_phrase in tweet_text:
-            pass  # Fallback to config trigger phrase
-        else:
+        if not self.trigger_re.search(tweet.text):
             return False
         
         # Must be recent enough
-        tweet_time = tweet.created_at.replace(tzinfo=None)
-        if datetime.now() - tweet_time > timedelta(hours=1):
+        if datetime.now(timezone.utc) - tweet.created_at > timedelta(hours=1):
             return False
         
         return True
     
-    def _extract_trigger_info(self, tweet, includes) -> Optional[Dict]:
+    def _get_replied_to_id(self, tweet):
+        """Get the ID of the tweet being replied to, if any"""
+        if hasattr(tweet, 'referenced_tweets') and tweet.referenced_tweets:
+            for ref in tweet.referenced_tweets:
+                if ref.type == 'replied_to':
+                    return ref.id
+        return None
+    
+    def _get_original_tweets(self, tweets, includes) -> Dict:
+        """
+        Resolve the tweets being replied to with at most one API call
+        
+        Args:
+            tweets: Trigger tweets from a search results page
+            includes: Expansions returned alongside the search response
+        
+        Returns:
+            Dictionary mapping original tweet ID to tweet object
+        """
+        original_tweets = {}
+        
+        # Referenced tweets are usually already expanded in the search response
+        for included in (includes or {}).get('tweets', []):
+            if getattr(included, 'author_id', None):
+                original_tweets[included.id] = included
+        
+        missing_ids = []
+        for tweet in tweets:
+            original_tweet_id = self._get_replied_to_id(tweet)
+            if original_tweet_id and original_tweet_id not in original_tweets and original_tweet_id not in missing_ids:
+                missing_ids.append(original_tweet_id)
+        
+        if missing_ids:
+            try:
+                # get_tweets accepts up to 100 IDs per request
+                for start in range(0, len(missing_ids), 100):
+                    response = self.client.get_tweets(
+                        ids=missing_ids[start:start + 100],
+                        tweet_fields=['author_id']
+                    )
+                    for original_tweet in response.data or []:
+                        original_tweets[original_tweet.id] = original_tweet
+            except Exception as e:
+                logger.error(f"Error getting original tweets: {str(e)}")
+        
+        return original_tweets
+    
+    def _extract_trigger_info(self, tweet, original_tweets: Dict) -> Optional[Dict]:
         """Extract information about the trigger and original tweet"""
         try:
             # Find the original tweet being replied to
-            original_tweet_id = None
+            original_tweet_id = self._get_replied_to_id(tweet)
             original_author_id = None
             
-            # Look for referenced tweets
-            if hasattr(tweet, 'referenced_tweets') and tweet.referenced_tweets:
-                for ref in tweet.referenced_tweets:
-                    if ref.type == 'replied_to':
-                        original_tweet_id = ref.id
-                        break
-            
             # Get original tweet details
             if original_tweet_id:
-                try:
-                    original_tweet = self.client.get_tweet(
-                        original_tweet_id,
-                        tweet_fields=['author_id']
-                    )
-                    if original_tweet.data:
-                        original_author_id = original_tweet.data.author_id
-                except Exception as e:
-                    logger.error(f"Error getting original tweet: {str(e)}")
-                    return None
+                original_tweet = original_tweets.get(original_tweet_id)
+                if original_tweet:
+                    original_author_id = original_tweet.author_id
             
             if not original_author_id:
                 logger.warning(f"Could not determine original author for trigger tweet {tweet.id}")
@@ -174,11 +342,46 @@ class XMonitor:
             logger.error(f"Error extracting trigger info: {str(e)}")
             return None
     
-    def _get_last_tweet_id(self) -> Optional[str]:
-        """Get the ID of the last processed tweet for pagination"""
-        # This would typically be stored in a database or file
-        # For now, return None to get recent tweets
-        return None
+    def _get_last_tweet_id(self) -> Optional[int]:
+        """Get the since_id to resume from: the newest tweet seen, or just below the oldest trigger awaiting a retry"""
+        if self._retry_floor is not None and self.last_tweet_id is not None:
+            return min(self.last_tweet_id, self._retry_floor)
+        return self.last_tweet_id
+    
+    def _mark_processed(self, tweet_id):
+        """Remember a processed tweet, evicting the oldest once over capacity"""
+        self.processed_tweets[tweet_id] = True
+        while len(self.processed_tweets) > self.config.MAX_PROCESSED_TWEETS:
+            self.processed_tweets.popitem(last=False)
+    
+    def _load_state(self):
+        """Restore polling position from the state file so restarts skip seen tweets"""
+        state = load_json_file(self.config.MONITOR_STATE_FILE)
+        if not state:
+            return
+        
+        try:
+            if state.get('last_tweet_id'):
+                self.last_tweet_id = int(state['last_tweet_id'])
+            if state.get('last_checked'):
+                self.last_checked = datetime.fromisoformat(state['last_checked'])
+            logger.info(f"Restored monitor state (since_id={self.last_tweet_id})")
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid monitor state: {str(e)}")
+    
+    def save_state(self):
+        """
+        Persist polling position to the state file
+        
+        Call only once the triggers yielded so far have finished and been reported to
+        trigger_finished(): a restart resumes after this position, so anything still
+        in flight would be skipped.
+        """
+        last_tweet_id = self._get_last_tweet_id()
+        save_json_file(self.config.MONITOR_STATE_FILE, {
+            'last_tweet_id': str(last_tweet_id) if last_tweet_id else None,
+            'last_checked': self.last_checked.isoformat()
+        })
     
     def post_reply(self, tweet_id: str, message: str) -> bool:
         """
@@ -213,6 +416,30 @@ class XMonitor:
             logger.error(f"Error posting reply: {str(e)}")
             return False
     
+    def _get_cached(self, cache_key: str, fetch, default):
+        """
+        Return a cached lookup result, fetching and caching it on a miss
+        
+        Args:
+            cache_key: Key for the lookup in the user cache
+            fetch: Callable returning the result, or _FAILED if the API call failed
+            default: Returned, uncached, when the fetch failed
+        """
+        with self.cache_lock:
+            cached = self.user_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        
+        result = fetch()
+        if result is _FAILED:
+            return default  # Rate limits and server errors are retried on the next call
+        
+        # Cache empty results briefly so deleted or protected accounts aren't re-fetched constantly
+        ttl = self.config.USER_CACHE_TTL if result else self.config.USER_CACHE_NEGATIVE_TTL
+        with self.cache_lock:
+            self.user_cache.set(cache_key, result, ttl)
+        return result
+    
     def get_user_info(self, user_id: str) -> Optional[Dict]:
         """
         Get detailed user information
@@ -223,6 +450,14 @@ class XMonitor:
         Returns:
             Dictionary with user information or None if error
         """
+        return self._get_cached(
+            generate_cache_key('user_info', user_id),
+            lambda: self._fetch_user_info(user_id),
+            None
+        )
+    
+    def _fetch_user_info(self, user_id: str):
+        """Fetch user information from the X API; None if the user doesn't exist, _FAILED on error"""
         try:
             user = self.client.get_user(
                 id=user_id,
@@ -252,7 +487,7 @@ class XMonitor:
             
         except Exception as e:
             logger.error(f"Error getting user info for {user_id}: {str(e)}")
-            return None
+            return _FAILED
     
     def get_user_tweets(self, user_id: str, max_results: int = 20) -> List[Dict]:
         """
@@ -265,6 +500,14 @@ class XMonitor:
         Returns:
             List of tweet information dictionaries
         """
+        return self._get_cached(
+            generate_cache_key('user_tweets', user_id, max_results),
+            lambda: self._fetch_user_tweets(user_id, max_results),
+            []
+        )
+    
+    def _fetch_user_tweets(self, user_id: str, max_results: int):
+        """Fetch recent tweets for a user from the X API; _FAILED on error"""
         try:
             tweets = self.client.get_users_tweets(
                 id=user_id,
@@ -297,4 +540,4 @@ class XMonitor:
             
         except Exception as e:
             logger.error(f"Error getting tweets for user {user_id}: {str(e)}")
-            return []
+            return _FAILED
@@ -4,14 +4,57 @@ Generates trustworthiness reports based on analysis
 """
 
 import logging
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Bucket boundaries and the label for each bucket, looked up with bisect.
+# Risk uses bisect_right (a score equal to a boundary moves up a bucket);
+# the others use bisect_left (a value must exceed the boundary).
+RISK_THRESHOLDS = (20, 40, 70)
+RISK_LEVELS = (
+    ("🟢", "LOW RISK"),
+    ("🟡", "MODERATE RISK"),
+    ("🟠", "HIGH RISK"),
+    ("🔴", "VERY HIGH RISK")
+)
+AGE_THRESHOLDS = (30, 365)
+AGE_UNITS = ((1, "d"), (30, "m"), (365, "y"))
+FOLLOWER_THRESHOLDS = (1000, 1000000)
+FOLLOWER_UNITS = ((1, ""), (1000, "K"), (1000000, "M"))
+ENGAGEMENT_THRESHOLDS = (10, 100)
+ENGAGEMENT_LABELS = ("📊 Low engagement", "📊 Moderate engagement", "📊 High engagement")
+
+TWEET_LIMIT = 280
+
+def _tweet_len(text: str) -> int:
+    """Length of text in UTF-16 code units, so emoji outside the BMP count as 2"""
+    return len(text.encode('utf-16-le')) // 2
+
+def _clip_tweet(text: str, limit: int = TWEET_LIMIT) -> str:
+    """Cut text to at most limit UTF-16 code units, without splitting a surrogate pair"""
+    # A half surrogate pair left at the cut is dropped by errors='ignore'
+    return text.encode('utf-16-le')[:limit * 2].decode('utf-16-le', errors='ignore')
+
 class ReportGenerator:
     """Generates human-readable trustworthiness reports"""
     
+    __slots__ = ('config',)
+    
+    _HEADER = "🔍 RUGGUARD TRUST REPORT for @{}"
+    _FOOTER = ("", "⚠️ This is an automated analysis. DYOR!", "#RUGGUARD #TrustScore")
+    _RISK_TEMPLATE = "{} {} (Score: {}/100)".format
+    _AGE_TEMPLATE = "📅 {}{} old".format
+    _FOLLOWERS_TEMPLATE = "👥 {}{} followers".format
+    _ERROR_TEMPLATES = {
+        "user_not_found": "🔍 RUGGUARD: User @{} not found or protected. #RUGGUARD",
+        "api_error": "🔍 RUGGUARD: API error analyzing @{}. Try again later. #RUGGUARD",
+        "analysis_failed": "🔍 RUGGUARD: Analysis failed for @{}. #RUGGUARD",
+        "general": "🔍 RUGGUARD: Error analyzing @{}. Please try again. #RUGGUARD"
+    }
+    
     def __init__(self, config):
         self.config = config
     
@@ -28,136 +71,114 @@ class ReportGenerator:
             Formatted report string
         """
         try:
-            # Start building the report
-            report_parts = []
-            
-            # Header
             username = analysis.get('username', 'unknown')
-            report_parts.append(f"🔍 RUGGUARD TRUST REPORT for @{username}")
-            report_parts.append("")
             
-            # Trust Status (most important first)
+            # Build each section once; most important (trust status) first
             trust_status = self._generate_trust_status(trust_score)
-            report_parts.append(trust_status)
-            
-            # Risk Assessment
             risk_assessment = self._generate_risk_assessment(analysis)
-            report_parts.append(risk_assessment)
-            
-            # Key Metrics
-            key_metrics = self._generate_key_metrics(analysis)
-            report_parts.append(key_metrics)
-            
-            # Detailed Analysis
-            detailed_analysis = self._generate_detailed_analysis(analysis)
-            report_parts.append(detailed_analysis)
-            
-            # Footer
-            report_parts.append("")
-            report_parts.append("⚠️ This is an automated analysis. DYOR!")
-            report_parts.append("#RUGGUARD #TrustScore")
-            
-            # Join all parts
-            full_report = "\n".join(report_parts)
+            key_metrics = " | ".join(self._generate_key_metrics(analysis))
+            detailed_analysis = " | ".join(self._generate_detailed_analysis(analysis))
+            
+            # Join all parts in a single pass
+            full_report = "\n".join((
+                self._HEADER.format(username),
+                "",
+                *trust_status,
+                risk_assessment,
+                key_metrics,
+                detailed_analysis,
+                *self._FOOTER
+            ))
             
             # Ensure it fits Twitter's character limit
-            if len(full_report) > 280:
-                full_report = self._truncate_report(report_parts)
+            if _tweet_len(full_report) > TWEET_LIMIT:
+                full_report = self._truncate_report(username, trust_status, risk_assessment, key_metrics)
             
             return full_report
             
         except Exception as e:
-            logger.error(f"Error generating report: {str(e)}")
+            logger.error("Error generating report: %s", e)
             return f"🔍 RUGGUARD: Error analyzing @{username}. Please try again later. #RUGGUARD"
     
-    def _generate_trust_status(self, trust_score: Dict) -> str:
-        """Generate trust status section"""
+    def _generate_trust_status(self, trust_score: Dict) -> Tuple[str, ...]:
+        """Generate trust status section as a tuple of lines, headline first"""
         try:
             if trust_score.get('is_trusted', False):
                 trust_level = trust_score.get('trust_level', 'unknown')
                 if trust_level == 'directly_trusted':
-                    return "✅ VERIFIED TRUSTED ACCOUNT\n• Account is on Project RUGGUARD's trusted list\n• Automatically vouched by the system"
-                elif trust_level == 'network_backed':
+                    return (
+                        "✅ VERIFIED TRUSTED ACCOUNT",
+                        "• Account is on Project RUGGUARD's trusted list",
+                        "• Automatically vouched by the system"
+                    )
+                elif trust_level in ('network_backed', 'vouched_by_trusted'):
                     trusted_followers = trust_score.get('trusted_followers', [])
                     count = len(trusted_followers)
-                    return f"🤝 NETWORK BACKED ACCOUNT\n• Followed by {count} trusted accounts from our list\n• Meets minimum threshold of 3 trusted followers"
+                    return (
+                        "🤝 NETWORK BACKED ACCOUNT",
+                        f"• Followed by {count} trusted accounts from our list",
+                        "• Meets minimum threshold of 3 trusted followers"
+                    )
             else:
                 trusted_count = trust_score.get('trusted_followers_count', 0)
                 if trusted_count > 0:
-                    return f"⚠️ PARTIALLY BACKED\n• Followed by {trusted_count} trusted account(s)\n• Needs 3+ for full verification"
+                    return (
+                        "⚠️ PARTIALLY BACKED",
+                        f"• Followed by {trusted_count} trusted account(s)",
+                        "• Needs 3+ for full verification"
+                    )
                 else:
-                    return "❌ UNVERIFIED ACCOUNT\n• Not on trusted list\n• No trusted accounts following\n• Requires manual verification"
+                    return (
+                        "❌ UNVERIFIED ACCOUNT",
+                        "• Not on trusted list",
+                        "• No trusted accounts following",
+                        "• Requires manual verification"
+                    )
         except Exception as e:
-            logger.error(f"Error generating trust status: {str(e)}")
-            return "❓ UNKNOWN: Unable to verify trust status"
+            logger.error("Error generating trust status: %s", e)
+        return ("❓ UNKNOWN: Unable to verify trust status",)
     
     def _generate_risk_assessment(self, analysis: Dict) -> str:
         """Generate risk assessment section"""
         try:
             risk_score = analysis.get('risk_score', 50)
+            risk_emoji, risk_label = RISK_LEVELS[bisect_right(RISK_THRESHOLDS, risk_score)]
             
-            if risk_score < 20:
-                risk_emoji = "🟢"
-                risk_label = "LOW RISK"
-            elif risk_score < 40:
-                risk_emoji = "🟡"
-                risk_label = "MODERATE RISK"
-            elif risk_score < 70:
-                risk_emoji = "🟠"
-                risk_label = "HIGH RISK"
-            else:
-                risk_emoji = "🔴"
-                risk_label = "VERY HIGH RISK"
-            
-            return f"{risk_emoji} {risk_label} (Score: {risk_score}/100)"
+            return self._RISK_TEMPLATE(risk_emoji, risk_label, risk_score)
             
         except Exception as e:
-            logger.error(f"Error generating risk assessment: {str(e)}")
+            logger.error("Error generating risk assessment: %s", e)
             return "❓ RISK: Unable to calculate"
     
-    def _generate_key_metrics(self, analysis: Dict) -> str:
-        """Generate key metrics section"""
+    def _generate_key_metrics(self, analysis: Dict) -> Tuple[str, ...]:
+        """Generate key metrics section fragments"""
         try:
-            metrics = []
-            
             # Account age
             age_data = analysis.get('account_age', {})
             age_days = age_data.get('days', 0)
-            if age_days > 365:
-                metrics.append(f"📅 {age_days//365}y old")
-            elif age_days > 30:
-                metrics.append(f"📅 {age_days//30}m old")
-            else:
-                metrics.append(f"📅 {age_days}d old")
+            age_divisor, age_unit = AGE_UNITS[bisect_left(AGE_THRESHOLDS, age_days)]
             
             # Followers
             raw_metrics = analysis.get('raw_metrics', {})
             followers = raw_metrics.get('followers_count', 0)
-            if followers > 1000000:
-                metrics.append(f"👥 {followers//1000000}M followers")
-            elif followers > 1000:
-                metrics.append(f"👥 {followers//1000}K followers")
-            else:
-                metrics.append(f"👥 {followers} followers")
+            follower_divisor, follower_unit = FOLLOWER_UNITS[bisect_left(FOLLOWER_THRESHOLDS, followers)]
             
             # Engagement
             engagement = analysis.get('engagement_analysis', {})
             avg_likes = engagement.get('avg_likes', 0)
-            if avg_likes > 100:
-                metrics.append("📊 High engagement")
-            elif avg_likes > 10:
-                metrics.append("📊 Moderate engagement")
-            else:
-                metrics.append("📊 Low engagement")
             
-            return " | ".join(metrics)
+            return (
+                self._AGE_TEMPLATE(age_days // age_divisor, age_unit),
+                self._FOLLOWERS_TEMPLATE(followers // follower_divisor, follower_unit),
+                ENGAGEMENT_LABELS[bisect_left(ENGAGEMENT_THRESHOLDS, avg_likes)]
+            )
             
         except Exception as e:
-            logger.error(f"Error generating key metrics: {str(e)}")
-            return "📊 Metrics unavailable"
+            logger.error("Error generating key metrics: %s", e)
+            return ("📊 Metrics unavailable",)
     
-    def _generate_detailed_analysis(self, analysis: Dict) -> str:
-        """Generate detailed analysis section"""
+    def _generate_detailed_analysis(self, analysis: Dict) -> Tuple[str, ...]:
+        """Generate detailed analysis section fragments"""
         try:
             details = []
             
@@ -193,52 +214,41 @@ class ReportGenerator:
             if analysis.get('verification_status', False):
                 details.append("✅ Verified account")
             
-            return " | ".join(details) if details else "Analysis complete"
+            return tuple(details) if details else ("Analysis complete",)
             
         except Exception as e:
-            logger.error(f"Error generating detailed analysis: {str(e)}")
-            return "Analysis details unavailable"
+            logger.error("Error generating detailed analysis: %s", e)
+            return ("Analysis details unavailable",)
     
-    def _truncate_report(self, report_parts: List[str]) -> str:
+    def _truncate_report(self, username: str, trust_status: Tuple[str, ...],
+                         risk_assessment: str, key_metrics: str) -> str:
         """Truncate report to fit Twitter's character limit"""
         try:
             # Priority order: trust status, risk assessment, key metrics, footer
-            essential_parts = [
-                report_parts[0],  # Header
-                report_parts[2],  # Trust status
-                report_parts[3],  # Risk assessment
-                report_parts[4],  # Key metrics
+            truncated = "\n".join((
+                self._HEADER.format(username),
+                *trust_status,
+                risk_assessment,
+                key_metrics,
                 "⚠️ DYOR! #RUGGUARD"  # Simplified footer
-            ]
-            
-            truncated = "\n".join(essential_parts)
+            ))
             
             # If still too long, further truncate
-            if len(truncated) > 280:
-                # Ultra-compact version
-                username = report_parts[0].split('@')[1].split()[0] if '@' in report_parts[0] else 'user'
-                trust_line = report_parts[2].split(':')[0] if ':' in report_parts[2] else report_parts[2]
-                risk_line = report_parts[3].split('(')[0].strip() if '(' in report_parts[3] else report_parts[3]
-                
-                truncated = f"🔍 @{username}\n{trust_line}\n{risk_line}\n⚠️ DYOR! #RUGGUARD"
+            if _tweet_len(truncated) > TWEET_LIMIT:
+                # Ultra-compact version: trust headline and risk label only
+                risk_line = risk_assessment.partition(' (')[0]
+                truncated = f"🔍 @{username}\n{trust_status[0]}\n{risk_line}\n⚠️ DYOR! #RUGGUARD"
             
-            return truncated[:280]  # Hard limit
+            return _clip_tweet(truncated)  # Hard limit, counted like _tweet_len
             
         except Exception as e:
-            logger.error(f"Error truncating report: {str(e)}")
+            logger.error("Error truncating report: %s", e)
             return "🔍 RUGGUARD: Analysis complete. Check logs for details. #RUGGUARD"
     
     def generate_error_report(self, username: str, error_type: str = "general") -> str:
         """Generate an error report"""
-        error_messages = {
-            "user_not_found": f"🔍 RUGGUARD: User @{username} not found or protected.",
-            "api_error": f"🔍 RUGGUARD: API error analyzing @{username}. Try again later.",
-            "analysis_failed": f"🔍 RUGGUARD: Analysis failed for @{username}.",
-            "general": f"🔍 RUGGUARD: Error analyzing @{username}. Please try again."
-        }
-        
-        message = error_messages.get(error_type, error_messages["general"])
-        return f"{message} #RUGGUARD"
+        template = self._ERROR_TEMPLATES.get(error_type, self._ERROR_TEMPLATES["general"])
+        return template.format(username)
     
     def generate_rate_limit_report(self) -> str:
         """Generate report for rate limit situations"""
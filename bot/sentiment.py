@@ -0,0 +1,78 @@
+"""
+Sentiment Module
+Lightweight lexicon-based polarity scoring for tweet text
+"""
+
+import re
+from functools import lru_cache
+
+# Word polarities on TextBlob's -1.0 (negative) to 1.0 (positive) scale
+POLARITY_LEXICON = {
+    # Positive
+    'amazing': 0.6, 'awesome': 1.0, 'beautiful': 0.85, 'best': 1.0, 'better': 0.5,
+    'brilliant': 0.9, 'bullish': 0.5, 'celebrate': 0.5, 'clean': 0.37, 'congrats': 0.6,
+    'congratulations': 0.6, 'cool': 0.35, 'excellent': 1.0, 'excited': 0.4, 'exciting': 0.3,
+    'fair': 0.7, 'fantastic': 0.4, 'fine': 0.42, 'fun': 0.3, 'glad': 0.5,
+    'good': 0.7, 'grateful': 0.6, 'great': 0.8, 'happy': 0.8, 'helpful': 0.5,
+    'honest': 0.6, 'impressive': 1.0, 'incredible': 0.9, 'interesting': 0.5, 'legit': 0.5,
+    'love': 0.5, 'lovely': 0.5, 'nice': 0.6, 'perfect': 1.0,
+    'positive': 0.23, 'proud': 0.8, 'reliable': 0.6, 'safe': 0.5, 'secure': 0.4,
+    'solid': 0.4, 'strong': 0.43, 'success': 0.3, 'successful': 0.75, 'thank': 0.3,
+    'thanks': 0.3, 'transparent': 0.5, 'trust': 0.4, 'trusted': 0.5, 'useful': 0.3,
+    'win': 0.8, 'winning': 0.5, 'wonderful': 1.0, 'wow': 0.1,
+    # Negative
+    'angry': -0.5, 'awful': -1.0, 'bad': -0.7, 'bearish': -0.5, 'boring': -1.0,
+    'broken': -0.4, 'crash': -0.6, 'crashed': -0.6, 'dead': -0.2, 'disappointed': -0.75,
+    'disappointing': -0.6, 'dump': -0.5, 'dumped': -0.5, 'exploit': -0.6, 'fail': -0.5,
+    'failed': -0.5, 'fake': -0.5, 'fraud': -0.8, 'hack': -0.5, 'hacked': -0.6,
+    'hate': -0.8, 'horrible': -1.0, 'lie': -0.5, 'liar': -0.7, 'lost': -0.3,
+    'negative': -0.3, 'poor': -0.4, 'rekt': -0.6, 'risky': -0.3, 'rug': -0.8,
+    'rugged': -0.8, 'sad': -0.5, 'scam': -1.0, 'scammer': -1.0, 'scammers': -1.0,
+    'shady': -0.6, 'stolen': -0.7, 'stupid': -0.8, 'terrible': -1.0, 'ugly': -0.7,
+    'unsafe': -0.5, 'useless': -0.5, 'warning': -0.2, 'worse': -0.4, 'worst': -1.0,
+    'wrong': -0.5
+}
+
+# Words that invert the polarity of the next sentiment word within reach, damped as TextBlob does
+NEGATIONS = frozenset({'not', 'no', 'never', "don't", "isn't", "wasn't", "aren't", "can't", "won't"})
+NEGATION_FACTOR = -0.5
+NEGATION_WINDOW = 3  # words a negation reaches; punctuation ends it sooner
+
+# Words, plus the clause-ending punctuation that closes a negation's scope
+_TOKEN_RE = re.compile(r"[a-z']+|[.,;:!?]")
+_CLAUSE_END = frozenset('.,;:!?')
+
+@lru_cache(maxsize=4096)
+def polarity(text: str) -> float:
+    """
+    Score text polarity as the mean polarity of its sentiment-bearing words
+    
+    Args:
+        text: Text to score
+    
+    Returns:
+        Polarity from -1.0 (negative) to 1.0 (positive), 0.0 if no sentiment words
+    """
+    total = 0.0
+    scored = 0
+    negate = 0  # Words left in the current negation's scope
+    
+    for word in _TOKEN_RE.findall(text.lower()):
+        if word in NEGATIONS:
+            negate = NEGATION_WINDOW
+            continue
+        if word in _CLAUSE_END:
+            negate = 0
+            continue
+        
+        score = POLARITY_LEXICON.get(word)
+        if score is not None:
+            total += score * NEGATION_FACTOR if negate else score
+            scored += 1
+            negate = 0
+        elif negate:
+            negate -= 1
+    
+    if not scored:
+        return 0.0
+    return max(-1.0, min(1.0, total / scored))
@@ -4,21 +4,40 @@ Handles the trusted accounts list and cross-referencing
 """
 
 import requests
+import tweepy
+from requests.adapters import HTTPAdapter
 import logging
+import threading
 import time
-from typing import List, Dict, Set, Optional
-from datetime import datetime, timedelta
+from itertools import islice
+from typing import List, Dict, Set, Optional, Tuple
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 class TrustedAccountsManager:
     """Manages trusted accounts list and verification"""
     
-    def __init__(self, config):
+    __slots__ = (
+        'config', '_monitor', 'trusted_accounts', 'last_update', '_last_update_mono',
+        '_trusted_id_cache', '_resolve_lock', '_session', '_etag', '_last_modified', 'cache_file'
+    )
+    
+    def __init__(self, config, monitor=None):
         self.config = config
-        self.trusted_accounts = set()
+        self._monitor = monitor  # Shared XMonitor, created on first use if not supplied
+        self.trusted_accounts = frozenset()  # Normalized handles, rebuilt whole on each update
         self.last_update = None
-        self.cache_file = 'trusted_accounts_cache.txt'
+        self._last_update_mono = 0.0  # time.monotonic() of the last refresh, immune to clock jumps
+        self._trusted_id_cache = None  # user_id -> handle, resolved lazily per list update
+        self._resolve_lock = threading.Lock()  # One resolution at a time across analysis workers
+        
+        # Reused connection for list refreshes; validators allow 304 responses
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self._etag = None
+        self._last_modified = None
+        self.cache_file = 'trusted_accounts_cache.txt'  # One normalized handle per line
         
         # Load cached trusted accounts
         self._load_cached_accounts()
@@ -32,79 +51,91 @@ class TrustedAccountsManager:
         """
         try:
             # Check if update is needed
-            if self.last_update and (datetime.now() - self.last_update).seconds < self.config.TRUSTED_ACCOUNTS_UPDATE_INTERVAL:
+            if self._last_update_mono and time.monotonic() - self._last_update_mono < self.config.TRUSTED_ACCOUNTS_UPDATE_INTERVAL:
                 logger.info("Trusted accounts list is up to date")
                 return True
             
             logger.info("Updating trusted accounts list from GitHub...")
             
-            # Fetch the list from GitHub
-            response = requests.get(self.config.TRUSTED_ACCOUNTS_URL, timeout=30)
-            response.raise_for_status()
+            # Fetch the list from GitHub, revalidating against the previous copy
+            headers = {}
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+            
+            # Stream the body line by line rather than decoding it whole
+            with self._session.get(self.config.TRUSTED_ACCOUNTS_URL, headers=headers,
+                                   stream=True, timeout=30) as response:
+                if response.status_code == 304:
+                    self.last_update = datetime.now()
+                    self._last_update_mono = time.monotonic()
+                    logger.info("Trusted accounts list unchanged")
+                    return True
+                response.raise_for_status()
+                
+                if response.encoding is None:
+                    response.encoding = 'utf-8'
+                
+                # Extract usernames/handles (assuming one per line), normalizing each line once
+                new_trusted_accounts = frozenset(
+                    username for username in map(self._normalize, response.iter_lines(decode_unicode=True))
+                    if username and not username.startswith('#')  # Skip comments
+                )
             
-            # Parse the list
-            content = response.text.strip()
-            if not content:
+            if not new_trusted_accounts:
                 logger.warning("Trusted accounts list is empty")
                 return False
             
-            # Extract usernames/handles (assuming one per line)
-            new_trusted_accounts = set()
-            for line in content.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('#'):  # Skip comments
-                    # Remove @ symbol if present
-                    username = line.lstrip('@').lower()
-                    if username:
-                        new_trusted_accounts.add(username)
-            
             self.trusted_accounts = new_trusted_accounts
+            self._trusted_id_cache = None
             self.last_update = datetime.now()
+            self._last_update_mono = time.monotonic()
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
             
             # Cache the accounts
             self._cache_accounts()
             
-            logger.info(f"Updated trusted accounts list: {len(self.trusted_accounts)} accounts")
+            logger.info("Updated trusted accounts list: %d accounts", len(self.trusted_accounts))
             return True
             
         except Exception as e:
-            logger.error(f"Error updating trusted accounts list: {str(e)}")
+            logger.error("Error updating trusted accounts list: %s", e)
             return False
     
-    def check_trust_score(self, user_id: str) -> Dict:
+    def check_trust_score(self, user_id: str, username: Optional[str] = None) -> Dict:
         """
         Check trust score for a user based on trusted accounts
         
         Args:
             user_id: X user ID to check
+            username: Handle of the user, if already known; lets directly
+                trusted accounts skip the user lookup
         
         Returns:
             Dictionary with trust score information
         """
         try:
-            from .monitor import XMonitor
-            monitor = XMonitor(self.config)
+            # Directly trusted handles need no API calls at all
+            if username and self._normalize(username) in self.trusted_accounts:
+                return self._directly_trusted_score(self._normalize(username))
+            
+            monitor = self._get_monitor()
             
             # Get user info
             user_info = monitor.get_user_info(user_id)
             if not user_info:
                 return self._default_trust_score()
             
-            username = user_info['username'].lower()
+            username = self._normalize(user_info['username'])
             
             # Check if user is directly in trusted list
             if username in self.trusted_accounts:
-                return {
-                    'is_trusted': True,
-                    'trust_level': 'directly_trusted',
-                    'trusted_followers': [],
-                    'trusted_followers_count': 0,
-                    'vouched_by_trusted': True,
-                    'explanation': f"@{username} is directly on the trusted accounts list"
-                }
+                return self._directly_trusted_score(username)
             
             # Check if user is followed by trusted accounts
-            trusted_followers = self._get_trusted_followers(user_id, monitor)
+            trusted_followers, checked = self._get_trusted_followers(user_id, monitor)
             trusted_count = len(trusted_followers)
             
             # Determine trust level
@@ -123,6 +154,10 @@ class TrustedAccountsManager:
                 is_trusted = False
                 explanation = "Not followed by any trusted accounts"
             
+            if checked is not None:
+                # Only the newest followers were fetched, so older trusted followers may be missed
+                explanation += f" (among the {checked:,} most recent followers checked)"
+            
             return {
                 'is_trusted': is_trusted,
                 'trust_level': trust_level,
@@ -133,64 +168,114 @@ class TrustedAccountsManager:
             }
             
         except Exception as e:
-            logger.error(f"Error checking trust score for {user_id}: {str(e)}")
+            logger.error("Error checking trust score for %s: %s", user_id, e)
             return self._default_trust_score()
     
-    def _get_trusted_followers(self, user_id: str, monitor) -> List[str]:
+    def _get_trusted_followers(self, user_id: str, monitor) -> Tuple[List[str], Optional[int]]:
         """
         Get list of trusted accounts that follow the user
         
+        Followers are fetched newest first, 1000 per page, up to MAX_FOLLOWER_PAGES pages.
+        
         Args:
             user_id: User ID to check
             monitor: XMonitor instance
         
         Returns:
-            List of trusted account usernames that follow the user
+            Trusted account usernames that follow the user, and the number of
+            followers checked if the page limit cut the list short (else None)
         """
-        trusted_followers = []
-        
         try:
-            # Note: This is a simplified approach due to API limitations
-            # In a full implementation, you would need to:
-            # 1. Get the user's followers
-            # 2. Check which ones are in the trusted list
-            # 
-            # For now, we'll use a different approach - check if trusted accounts follow the user
-            # This requires checking each trusted account individually
-            
-            # Sample a subset of trusted accounts to check (to avoid rate limits)
-            trusted_sample = list(self.trusted_accounts)[:20]  # Check first 20
-            
-            for trusted_username in trusted_sample:
-                try:
-                    # Get trusted account info
-                    trusted_user = monitor.client.get_user(username=trusted_username)
-                    if not trusted_user.data:
-                        continue
-                    
-                    trusted_user_id = trusted_user.data.id
-                    
-                    # Check if trusted user follows our target user
-                    # Note: This approach is limited by API rate limits
-                    # In production, you'd want to implement more efficient batching
-                    
-                    time.sleep(0.1)  # Small delay to avoid rate limits
-                    
-                    # For now, we'll simulate this check
-                    # In a real implementation, you'd use the followers endpoint
-                    # followers = monitor.client.get_users_followers(trusted_user_id)
-                    
-                except Exception as e:
-                    logger.debug(f"Error checking trusted account {trusted_username}: {str(e)}")
-                    continue
+            trusted_ids = self._resolve_trusted_ids(monitor)
+            if not trusted_ids:
+                return [], None
+            
+            pages = tweepy.Paginator(
+                monitor.client.get_users_followers,
+                id=user_id,
+                max_results=1000,
+                limit=self.config.MAX_FOLLOWER_PAGES
+            )
             
-            # Simplified approach - return empty list for now
-            # This would be replaced with actual API calls in production
-            return trusted_followers
+            # Probe the trusted map per follower: a page is at most 1000 users,
+            # while keys() & ... would copy every trusted ID into a new set first
+            trusted = set()
+            checked = 0
+            next_token = None
+            for page in pages:
+                for user in page.data or ():
+                    follower_id = str(user.id)
+                    if follower_id in trusted_ids:
+                        trusted.add(trusted_ids[follower_id])
+                checked += len(page.data or ())
+                next_token = (page.meta or {}).get('next_token')
+            
+            return sorted(trusted), (checked if next_token else None)
             
         except Exception as e:
-            logger.error(f"Error getting trusted followers: {str(e)}")
-            return []
+            logger.error("Error getting trusted followers: %s", e)
+            return [], None
+    
+    def _resolve_trusted_ids(self, monitor) -> Dict[str, str]:
+        """
+        Resolve trusted handles to user IDs, 100 handles per request
+        
+        The mapping is cached until the trusted list next changes, but only when
+        every batch resolved; after a failure the next call retries.
+        
+        Args:
+            monitor: XMonitor instance
+        
+        Returns:
+            Dictionary mapping trusted user IDs to their handles
+        """
+        if self._trusted_id_cache is not None:
+            return self._trusted_id_cache
+        
+        # Workers arriving together wait for a single resolution instead of each running their own
+        with self._resolve_lock:
+            if self._trusted_id_cache is not None:
+                return self._trusted_id_cache
+            
+            accounts = self.trusted_accounts
+            trusted_ids = {}
+            failed = 0
+            usernames = iter(accounts)
+            
+            # Take 100 handles at a time straight off the set, without copying it
+            while batch := list(islice(usernames, 100)):
+                try:
+                    response = monitor.client.get_users(usernames=batch)
+                    for user in response.data or ():
+                        trusted_ids[str(user.id)] = self._normalize(user.username)
+                except Exception as e:
+                    failed += 1
+                    logger.warning("Error resolving trusted accounts %s..%s: %s", batch[0], batch[-1], e)
+            
+            if failed:
+                logger.warning("Trusted account resolution incomplete (%d failed batches); will retry", failed)
+            elif accounts is self.trusted_accounts:
+                # Not cached if the list was replaced meanwhile, since the map would be stale
+                self._trusted_id_cache = trusted_ids
+            return trusted_ids
+    
+    def _get_monitor(self):
+        """Return the shared XMonitor, creating it on first use"""
+        if self._monitor is None:
+            from .monitor import XMonitor
+            self._monitor = XMonitor(self.config)
+        return self._monitor
+    
+    def _directly_trusted_score(self, username: str) -> Dict:
+        """Return trust score for an account on the trusted list"""
+        return {
+            'is_trusted': True,
+            'trust_level': 'directly_trusted',
+            'trusted_followers': [],
+            'trusted_followers_count': 0,
+            'vouched_by_trusted': True,
+            'explanation': f"@{username} is directly on the trusted accounts list"
+        }
     
     def _default_trust_score(self) -> Dict:
         """Return default trust score for error cases"""
@@ -206,24 +291,28 @@ class TrustedAccountsManager:
     def _load_cached_accounts(self):
         """Load cached trusted accounts from file"""
         try:
-            with open(self.cache_file, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    self.trusted_accounts = set(content.split('\n'))
-                    logger.info(f"Loaded {len(self.trusted_accounts)} cached trusted accounts")
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                # Same rules as the GitHub list, so a hand-edited cache still loads
+                accounts = frozenset(
+                    username for username in map(self._normalize, f)
+                    if username and not username.startswith('#')
+                )
+            if accounts:
+                self.trusted_accounts = accounts
+                logger.info("Loaded %d cached trusted accounts", len(self.trusted_accounts))
         except FileNotFoundError:
             logger.info("No cached trusted accounts found")
         except Exception as e:
-            logger.error(f"Error loading cached accounts: {str(e)}")
+            logger.error("Error loading cached accounts: %s", e)
     
     def _cache_accounts(self):
         """Cache trusted accounts to file"""
         try:
-            with open(self.cache_file, 'w') as f:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
                 f.write('\n'.join(sorted(self.trusted_accounts)))
             logger.debug("Cached trusted accounts to file")
         except Exception as e:
-            logger.error(f"Error caching accounts: {str(e)}")
+            logger.error("Error caching accounts: %s", e)
     
     def get_trusted_accounts_count(self) -> int:
         """Get number of trusted accounts"""
@@ -231,4 +320,9 @@ class TrustedAccountsManager:
     
     def is_account_trusted(self, username: str) -> bool:
         """Check if a specific account is trusted"""
-        return username.lower().lstrip('@') in self.trusted_accounts
+        return self._normalize(username) in self.trusted_accounts
+    
+    @staticmethod
+    def _normalize(username: str) -> str:
+        """Normalize a handle to the lowercase, @-less form stored in the trusted set"""
+        return username.strip().lstrip('@').lower()
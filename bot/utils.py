@@ -3,104 +3,214 @@ Utility functions for the RugguardBot
 """
 
 import logging
+import math
+import random
+import re
 import time
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 import hashlib
+import threading
+from collections import OrderedDict
+
+import tweepy
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON state files; the json module is used without it
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# URLs, mentions and hashtags, stripped from text in a single pass
+_STRIP_RE = re.compile(r'https?://\S+|[@#]\w+')
+_USERNAME_RE = re.compile(r'[^a-z0-9_]')
+
+# Largest suffix first, for format_number
+NUMBER_SUFFIXES = ((1000000000, "B"), (1000000, "M"), (1000, "K"))
+
+# Largest unit first, for calculate_time_ago
+TIME_AGO_UNITS = ((31536000, "y"), (2592000, "mo"), (86400, "d"), (3600, "h"), (60, "m"))
+
+# Error category for each tweepy HTTP exception class
+_API_ERROR_CODES = {
+    tweepy.TooManyRequests: "rate_limit",
+    tweepy.NotFound: "not_found",
+    tweepy.Forbidden: "forbidden",
+    tweepy.Unauthorized: "unauthorized"
+}
+
 class RateLimiter:
-    """Simple rate limiter for API calls"""
+    """Sliding-window-counter rate limiter for API calls, safe to share between threads"""
+    
+    __slots__ = ('max_calls', 'window_seconds', 'previous_count', 'current_count', 'window_start', 'lock')
     
     def __init__(self, max_calls: int, window_seconds: int):
         self.max_calls = max_calls
         self.window_seconds = window_seconds
-        self.calls = []
+        self.previous_count = 0  # Calls in the previous fixed window
+        self.current_count = 0  # Calls in the current fixed window
+        self.window_start = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _elapsed(self) -> float:
+        """Advance to the fixed window containing now and return time into it (caller holds the lock)"""
+        elapsed = time.monotonic() - self.window_start
+        if elapsed >= self.window_seconds:
+            windows = int(elapsed // self.window_seconds)
+            self.previous_count = self.current_count if windows == 1 else 0
+            self.current_count = 0
+            self.window_start += windows * self.window_seconds
+            elapsed -= windows * self.window_seconds
+        return elapsed
+    
+    def _estimate(self, elapsed: float) -> float:
+        """Calls in the sliding window, weighting the previous window by its overlap"""
+        return self.previous_count * (1 - elapsed / self.window_seconds) + self.current_count
     
     def can_make_call(self) -> bool:
         """Check if a call can be made within rate limits"""
-        now = time.time()
-        
-        # Remove old calls outside the window
-        self.calls = [call_time for call_time in self.calls if now - call_time < self.window_seconds]
-        
-        return len(self.calls) < self.max_calls
+        with self.lock:
+            return self._estimate(self._elapsed()) < self.max_calls
     
-    def make_call(self):
+    def make_call(self) -> None:
         """Record a call"""
-        self.calls.append(time.time())
+        with self.lock:
+            self._elapsed()
+            self.current_count += 1
+    
+    def try_acquire(self) -> bool:
+        """Check and record a call atomically; True if the call may proceed"""
+        with self.lock:
+            if self._estimate(self._elapsed()) < self.max_calls:
+                self.current_count += 1
+                return True
+            return False
     
     def wait_time(self) -> float:
         """Get time to wait before next call"""
-        if self.can_make_call():
-            return 0
-        
-        # Find the oldest call in the current window
-        now = time.time()
-        oldest_call = min(self.calls)
-        return self.window_seconds - (now - oldest_call)
+        with self.lock:
+            elapsed = self._elapsed()
+            if self._estimate(elapsed) < self.max_calls:
+                return 0
+            
+            window = self.window_seconds
+            if self.current_count < self.max_calls:
+                # The previous window's share decays enough within this window
+                return max(0.0, window * (1 - (self.max_calls - self.current_count) / self.previous_count) - elapsed)
+            
+            # Wait out this window, then for this window's calls to decay as the previous one
+            return window - elapsed + max(0.0, window * (1 - self.max_calls / self.current_count))
 
 class DataCache:
-    """Simple in-memory cache for API responses"""
+    """Simple in-memory LRU cache with per-entry TTL for API responses"""
+    
+    __slots__ = ('cache', 'default_ttl', 'max_entries')
     
-    def __init__(self, default_ttl: int = 300):  # 5 minutes default
-        self.cache = {}
+    def __init__(self, default_ttl: int = 300, max_entries: int = 1024):  # 5 minutes default
+        self.cache = OrderedDict()  # Least recently used first
         self.default_ttl = default_ttl
+        self.max_entries = max_entries
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
-        if key in self.cache:
-            data, expiry = self.cache[key]
-            if time.time() < expiry:
-                return data
-            else:
-                del self.cache[key]
-        return None
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Get value from cache, or default if missing or expired"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return default
+        
+        data, expiry = entry
+        if time.monotonic() >= expiry:
+            del self.cache[key]
+            return default
+        
+        self.cache.move_to_end(key)
+        return data
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Set value in cache"""
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set value in cache, evicting the least recently used entry when full"""
         if ttl is None:
             ttl = self.default_ttl
-        expiry = time.time() + ttl
+        expiry = time.monotonic() + ttl
         self.cache[key] = (value, expiry)
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
     
-    def clear_expired(self):
+    def clear_expired(self) -> None:
         """Clear expired entries"""
-        now = time.time()
+        now = time.monotonic()
         expired_keys = [key for key, (_, expiry) in self.cache.items() if now >= expiry]
         for key in expired_keys:
             del self.cache[key]
 
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, bounded false-positive rate"""
+    
+    __slots__ = ('size', 'hash_count', 'bits', 'count')
+    
+    def __init__(self, capacity: int, error_rate: float = 1e-6):
+        # Optimal bit count m = -n*ln(p)/ln(2)^2 and hash count k = (m/n)*ln(2)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, item: str) -> Iterator[int]:
+        """Bit positions for an item, by double hashing one 128-bit digest"""
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+    
+    def add(self, item: str) -> None:
+        """Add an item to the filter"""
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+    
+    def __len__(self) -> int:
+        return self.count
+
 class ProcessedTweetsTracker:
     """Track processed tweets to avoid duplicates"""
     
-    def __init__(self, max_entries: int = 1000):
-        self.processed = set()
+    __slots__ = ('current', 'previous', 'generation_size', 'error_rate', 'max_entries', 'confirm')
+    
+    def __init__(self, max_entries: int = 1000, error_rate: float = 1e-6,
+                 confirm: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            max_entries: Upper bound on remembered tweets; the most recent
+                max_entries // 2 are always remembered
+            error_rate: Target false-positive rate of each filter generation
+            confirm: Optional authoritative check (e.g. a database lookup),
+                consulted only when the filters report a tweet as processed
+        """
+        # Two filter generations: when the current one fills, it becomes the
+        # previous one and the oldest generation is dropped whole
+        self.generation_size = max(1, max_entries // 2)
+        self.error_rate = error_rate
+        self.current = BloomFilter(self.generation_size, error_rate)
+        self.previous = BloomFilter(self.generation_size, error_rate)
         self.max_entries = max_entries
-        self.last_cleanup = time.time()
+        self.confirm = confirm
     
     def is_processed(self, tweet_id: str) -> bool:
         """Check if tweet has been processed"""
-        return tweet_id in self.processed
+        if tweet_id not in self.current and tweet_id not in self.previous:
+            return False
+        return self.confirm(tweet_id) if self.confirm else True
     
-    def mark_processed(self, tweet_id: str):
+    def mark_processed(self, tweet_id: str) -> None:
         """Mark tweet as processed"""
-        self.processed.add(tweet_id)
-        
-        # Cleanup old entries periodically
-        if len(self.processed) > self.max_entries:
-            self._cleanup()
-    
-    def _cleanup(self):
-        """Remove old entries to prevent memory bloat"""
-        if time.time() - self.last_cleanup > 3600:  # Cleanup every hour
-            # Keep only the most recent entries (simple approach)
-            if len(self.processed) > self.max_entries:
-                processed_list = list(self.processed)
-                self.processed = set(processed_list[-self.max_entries//2:])
-            self.last_cleanup = time.time()
+        self.current.add(tweet_id)
+        if len(self.current) >= self.generation_size:
+            self.previous, self.current = self.current, BloomFilter(self.generation_size, self.error_rate)
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """Safely divide two numbers, returning default if division by zero"""
@@ -112,116 +222,87 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
         return default
 
 def format_number(num: int) -> str:
-    """Format number with K/M suffixes"""
-    try:
-        if num >= 1000000:
-            return f"{num/1000000:.1f}M"
-        elif num >= 1000:
-            return f"{num/1000:.1f}K"
-        else:
-            return str(num)
-    except (TypeError, ValueError):
+    """Format number with K/M/B suffixes"""
+    if isinstance(num, bool) or not isinstance(num, (int, float)):
         return "0"
+    return _format_number(num)
+
+# typed=True: 5 and 5.0 hash alike but render as "5" and "5.0", so they need separate entries
+@lru_cache(maxsize=1024, typed=True)
+def _format_number(num: int) -> str:
+    """Suffix lookup behind format_number; follower counts recur across reports"""
+    for divisor, suffix in NUMBER_SUFFIXES:
+        if num >= divisor:
+            return f"{num/divisor:.1f}{suffix}"
+    return str(num)
 
-def calculate_time_ago(timestamp: datetime) -> str:
+def calculate_time_ago(timestamp: Union[datetime, float]) -> str:
     """Calculate human-readable time ago string"""
     try:
-        now = datetime.now()
-        if timestamp.tzinfo:
-            timestamp = timestamp.replace(tzinfo=None)
+        # Naive datetimes are taken as local time; aware ones convert exactly
+        seconds = time.time() - (timestamp.timestamp() if isinstance(timestamp, datetime) else timestamp)
         
-        diff = now - timestamp
-        
-        if diff.days > 365:
-            return f"{diff.days // 365}y ago"
-        elif diff.days > 30:
-            return f"{diff.days // 30}mo ago"
-        elif diff.days > 0:
-            return f"{diff.days}d ago"
-        elif diff.seconds > 3600:
-            return f"{diff.seconds // 3600}h ago"
-        elif diff.seconds > 60:
-            return f"{diff.seconds // 60}m ago"
-        else:
-            return "now"
+        for unit_seconds, suffix in TIME_AGO_UNITS:
+            if seconds >= unit_seconds:
+                return f"{int(seconds // unit_seconds)}{suffix} ago"
+        return "now"
     except Exception:
         return "unknown"
 
 def clean_text(text: str) -> str:
     """Clean text for analysis"""
-    try:
-        if not text:
-            return ""
-        
-        # Remove URLs
-        import re
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        
-        # Remove mentions and hashtags for analysis
-        text = re.sub(r'@\w+', '', text)
-        text = re.sub(r'#\w+', '', text)
-        
-        # Clean up whitespace
-        text = ' '.join(text.split())
-        
-        return text.strip()
-    except Exception:
+    if not text or not isinstance(text, str):
         return ""
+    
+    # Remove URLs, mentions and hashtags for analysis, then collapse whitespace
+    return ' '.join(_STRIP_RE.sub('', text).split())
 
-def generate_cache_key(*args) -> str:
-    """Generate a cache key from arguments"""
+def generate_cache_key(*args: Any) -> str:
+    """Generate a cache key from arguments; short keys are used as-is"""
     try:
-        key_string = "|".join(str(arg) for arg in args)
-        return hashlib.md5(key_string.encode()).hexdigest()
+        key_string = "|".join(map(str, args))
+        if len(key_string) < 64:
+            return key_string
+        return hashlib.blake2b(key_string.encode(), digest_size=8).hexdigest()
     except Exception:
         return str(hash(str(args)))
 
 def validate_tweet_id(tweet_id: str) -> bool:
     """Validate if a string is a valid tweet ID"""
-    try:
-        # Tweet IDs are numeric strings
-        int(tweet_id)
-        return len(tweet_id) >= 10  # Minimum realistic length
-    except (ValueError, TypeError):
-        return False
+    # Tweet IDs are numeric strings; check length first, then ASCII digits
+    return isinstance(tweet_id, str) and len(tweet_id) >= 10 and tweet_id.isascii() and tweet_id.isdigit()
 
 def validate_user_id(user_id: str) -> bool:
     """Validate if a string is a valid user ID"""
-    try:
-        # User IDs are numeric strings
-        int(user_id)
-        return len(user_id) >= 5  # Minimum realistic length
-    except (ValueError, TypeError):
-        return False
+    # User IDs are numeric strings; check length first, then ASCII digits
+    return isinstance(user_id, str) and len(user_id) >= 5 and user_id.isascii() and user_id.isdigit()
 
 def sanitize_username(username: str) -> str:
     """Sanitize username for safe processing"""
-    try:
-        if not username:
-            return ""
-        
-        # Remove @ symbol and convert to lowercase
-        username = username.lstrip('@').lower()
-        
-        # Remove any non-alphanumeric characters except underscore
-        import re
-        username = re.sub(r'[^a-z0-9_]', '', username)
-        
-        return username
-    except Exception:
+    if not username or not isinstance(username, str):
         return ""
+    
+    # Remove @ symbol, lowercase, and drop any non-alphanumeric characters except underscore
+    return _USERNAME_RE.sub('', username.lstrip('@').lower())
 
-def log_api_call(endpoint: str, user_id: str = None, success: bool = True):
+def log_api_call(endpoint: str, user_id: Optional[str] = None, success: bool = True) -> None:
     """Log API call for monitoring"""
-    try:
-        status = "SUCCESS" if success else "FAILED"
-        user_info = f" for user {user_id}" if user_id else ""
-        logger.info(f"API call to {endpoint}{user_info}: {status}")
-    except Exception:
-        pass  # Don't let logging errors break the application
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("API call to %s%s: %s", endpoint, f" for user {user_id}" if user_id else "",
+                "SUCCESS" if success else "FAILED")
 
 def handle_api_error(error: Exception, context: str = "") -> str:
     """Handle API errors and return appropriate error message"""
+    # tweepy raises a distinct exception class per HTTP error status
+    code = _API_ERROR_CODES.get(type(error))
+    if code:
+        return code
+    for error_type, code in _API_ERROR_CODES.items():
+        if isinstance(error, error_type):
+            return code
+    
+    # Other exceptions are classified by message
     try:
         error_str = str(error).lower()
         
@@ -238,8 +319,20 @@ def handle_api_error(error: Exception, context: str = "") -> str:
     except Exception:
         return "general_error"
 
-def retry_on_failure(func, max_retries: int = 3, delay: float = 1.0):
-    """Retry function on failure with exponential backoff"""
+def retry_on_failure(func: Callable[[], Any], max_retries: int = 3, delay: float = 1.0,
+                     max_delay: float = 30.0) -> Any:
+    """
+    Retry function on failure with decorrelated-jitter backoff
+    
+    Rate-limit errors wait until the reset time the API reports, when known.
+    
+    Args:
+        func: Zero-argument callable to invoke
+        max_retries: Total attempts before the last error is raised
+        delay: Base backoff delay in seconds
+        max_delay: Upper bound for a single backoff delay
+    """
+    wait_time = delay
     for attempt in range(max_retries):
         try:
             return func()
@@ -247,15 +340,33 @@ def retry_on_failure(func, max_retries: int = 3, delay: float = 1.0):
             if attempt == max_retries - 1:
                 raise e
             
-            wait_time = delay * (2 ** attempt)
-            logger.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time}s: {str(e)}")
+            reset_wait = _rate_limit_reset_wait(e) if handle_api_error(e) == "rate_limit" else None
+            if reset_wait is not None:
+                wait_time = reset_wait
+            else:
+                # Spread retries from concurrent callers instead of retrying in lockstep
+                wait_time = min(max_delay, random.uniform(delay, wait_time * 3))
+            
+            logger.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time:.1f}s: {str(e)}")
             time.sleep(wait_time)
 
+def _rate_limit_reset_wait(error: Exception) -> Optional[float]:
+    """Seconds until the x-rate-limit-reset epoch on an API error response, if present"""
+    response = getattr(error, 'response', None)
+    reset = getattr(response, 'headers', {}).get('x-rate-limit-reset')
+    if not reset:
+        return None
+    try:
+        return max(0.0, int(reset) - time.time()) + 1
+    except (TypeError, ValueError):
+        return None
+
 def load_json_file(filepath: str) -> Dict:
     """Safely load JSON file"""
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            content = f.read()
+        return orjson.loads(content) if orjson else json.loads(content)
     except FileNotFoundError:
         logger.warning(f"JSON file not found: {filepath}")
         return {}
@@ -269,8 +380,12 @@ def load_json_file(filepath: str) -> Dict:
 def save_json_file(filepath: str, data: Dict) -> bool:
     """Safely save JSON file"""
     try:
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        if orjson:
+            content = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            content = json.dumps(data, indent=2, default=str).encode()
+        with open(filepath, 'wb') as f:
+            f.write(content)
         return True
     except Exception as e:
         logger.error(f"Error saving JSON file {filepath}: {str(e)}")
@@ -0,0 +1,292 @@
+"""
+Bot process tracking for the web dashboards
+"""
+
+import fcntl
+import os
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+STOP_TIMEOUT = 5.0  # seconds to wait after SIGTERM before sending SIGKILL
+START_LOCK_FILE = 'bot.lock'  # Serializes starts across dashboard worker processes
+
+class BotProcess:
+    """Tracks the main.py bot process, probing it through a pidfd rather than spawning pgrep"""
+    
+    def __init__(self, pid_file: Optional[str] = None):
+        """
+        Args:
+            pid_file: Optional file recording the tracked PID, so the bot is found again after a dashboard restart
+        """
+        self.pid_file = pid_file
+        self.lock_file = f'{pid_file}.lock' if pid_file else START_LOCK_FILE
+        self.pid = None
+        self.pidfd = None  # Becomes readable when the process exits
+        self._child = False  # True when this process spawned the bot and must reap it
+        self.lock = threading.Lock()
+        self._started = threading.Condition(self.lock)
+        
+        # Pick up a bot that was already running before the dashboard started
+        self._adopt(self._read_pid_file() or self._find_pid())
+    
+    def is_running(self) -> bool:
+        """Check whether the bot process is alive"""
+        with self.lock:
+            return self._check_running()
+    
+    def start(self) -> bool:
+        """
+        Launch the bot and track the new process, unless one is already running
+        
+        Returns:
+            False if a bot was already running and nothing was started
+        """
+        # Checked and spawned under one hold of both locks, so concurrent starts can't launch
+        # two bots: the thread lock covers this worker, the file lock the other gunicorn workers
+        with self.lock, self._start_lock():
+            if self._check_running():
+                return False
+            
+            # posix_spawn avoids copying the dashboard's address space the way fork does
+            pid = os.posix_spawn(
+                sys.executable, [sys.executable, 'main.py'], os.environ,
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                    (os.POSIX_SPAWN_DUP2, 1, 2),
+                ]
+            )
+            self._adopt(pid, child=True)
+            self._started.notify_all()
+            return True
+    
+    @contextmanager
+    def _start_lock(self):
+        """Hold an exclusive flock on lock_file, shared by every process using the same file"""
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # Also releases the flock
+    
+    def stop(self, timeout: float = STOP_TIMEOUT) -> bool:
+        """
+        Terminate the tracked bot, escalating to SIGKILL if it outlives timeout
+        
+        The lock is only held to send signals, so status checks aren't blocked while the bot shuts down.
+        
+        Returns:
+            False when no process is tracked, so the caller can fall back to pkill
+        """
+        with self.lock:
+            if self.pid is None:
+                return False
+            pid = self.pid
+            # Our own descriptor, so a concurrent _release can't close it mid-wait
+            fd = os.dup(self.pidfd) if self.pidfd is not None else None
+        
+        try:
+            if not self._signal(pid, fd, signal.SIGTERM) or self._wait(pid, fd, timeout):
+                return True
+            self._signal(pid, fd, signal.SIGKILL)
+            self._wait(pid, fd, 1.0)
+            return True
+        finally:
+            if fd is not None:
+                os.close(fd)
+            with self.lock:
+                if self.pid == pid:
+                    self._check_running()  # Reaps and releases the process once it has exited
+    
+    def wait_for_change(self, timeout: float) -> bool:
+        """
+        Block up to timeout seconds until the tracked bot exits or this process starts one
+        
+        Returns:
+            True if either happened, False on timeout
+        """
+        with self.lock:
+            if self.pidfd is None:
+                return self._started.wait(timeout)
+            # Our own descriptor, so a concurrent _release can't close it mid-wait
+            fd = os.dup(self.pidfd)
+        
+        try:
+            readable, _, _ = select.select([fd], [], [], timeout)
+            return bool(readable)
+        finally:
+            os.close(fd)
+    
+    def _check_running(self) -> bool:
+        """is_running() for a caller that holds the lock"""
+        if self.pid is None:
+            # Started elsewhere, e.g. by another dashboard worker
+            self._adopt(self._find_pid())
+            if self.pid is None:
+                return False
+        
+        if self._has_exited():
+            self._release()
+            return False
+        return True
+    
+    def _signal(self, pid: int, fd: Optional[int], sig: int) -> bool:
+        """Send sig to the bot; False if it is already gone"""
+        try:
+            with self.lock:
+                if self.pid != pid:
+                    return False  # Released by a concurrent status check after it exited
+                if fd is not None:
+                    # Through the pidfd, so a recycled PID can never be hit
+                    signal.pidfd_send_signal(fd, sig)
+                else:
+                    os.kill(pid, sig)
+            return True
+        except ProcessLookupError:
+            return False
+    
+    def _wait(self, pid: int, fd: Optional[int], timeout: float) -> bool:
+        """Wait up to timeout seconds, without holding the lock, for the bot to exit"""
+        if fd is not None:
+            readable, _, _ = select.select([fd], [], [], timeout)
+            return bool(readable)
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                if self.pid != pid or self._has_exited():
+                    return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+    
+    def _adopt(self, pid: Optional[int], child: bool = False):
+        """Track pid, opening a pidfd for it where the platform supports one"""
+        self._release()
+        if pid is None:
+            return
+        
+        try:
+            self.pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return  # Already gone
+        except (AttributeError, OSError):
+            self.pidfd = None  # No pidfd support; _has_exited falls back to signal 0
+        self.pid = pid
+        self._child = child
+        self._write_pid_file()
+    
+    def _release(self):
+        """Stop tracking the current process"""
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+        if self.pid is not None:
+            self._remove_pid_file()
+        self.pid = None
+        self.pidfd = None
+        self._child = False
+    
+    def _has_exited(self) -> bool:
+        """Non-blocking exit check for the tracked process"""
+        if self.pidfd is not None:
+            # select rather than poll, which gevent's monkey-patching removes
+            readable, _, _ = select.select([self.pidfd], [], [], 0)
+            if readable and self._child:
+                self._reap()
+            return bool(readable)
+        
+        if self._child:
+            return self._reap()  # A zombie child still answers signal 0
+        
+        try:
+            os.kill(self.pid, 0)
+            return False
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+    
+    def _reap(self) -> bool:
+        """Collect our own child's exit status so it doesn't linger as a zombie; True once it has exited"""
+        try:
+            pid, _ = os.waitpid(self.pid, os.WNOHANG)
+        except ChildProcessError:
+            return True  # Already reaped
+        return pid != 0
+    
+    def _read_pid_file(self) -> Optional[int]:
+        """Return the PID recorded in pid_file if that process still runs main.py, removing a stale file"""
+        if not self.pid_file:
+            return None
+        try:
+            with open(self.pid_file) as f:
+                pid = int(f.read().strip())
+        except (OSError, ValueError):
+            pid = None
+        
+        # The bot may have died while the dashboard was down and its PID been reused
+        if pid is not None and _runs_main_py(pid):
+            return pid
+        self._remove_pid_file()
+        return None
+    
+    def _write_pid_file(self):
+        """Record the tracked PID in pid_file"""
+        if not self.pid_file:
+            return
+        try:
+            with open(self.pid_file, 'w') as f:
+                f.write(str(self.pid))
+        except OSError:
+            pass
+    
+    def _remove_pid_file(self):
+        """Delete pid_file, if any"""
+        if not self.pid_file:
+            return
+        try:
+            os.remove(self.pid_file)
+        except FileNotFoundError:
+            pass
+    
+    @staticmethod
+    def _find_pid() -> Optional[int]:
+        """Find a running main.py process by walking /proc, falling back to pgrep"""
+        try:
+            return _find_main_py_pid()
+        except OSError:
+            pass  # No /proc, e.g. on macOS
+        
+        try:
+            result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
+        except OSError:
+            return None
+        pids = result.stdout.split()
+        return int(pids[0]) if pids else None
+
+def _runs_main_py(pid) -> bool:
+    """Whether process pid's command line runs main.py"""
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            argv = f.read().split(b'\0')
+    except (FileNotFoundError, PermissionError, ProcessLookupError):
+        return False  # Gone, not ours to read, or no /proc
+    
+    # Match the script argument itself so simple_main.py and the like don't count
+    return any(os.path.basename(arg) == b'main.py' for arg in argv)
+
+def _find_main_py_pid() -> Optional[int]:
+    """Scan /proc for a process whose command line runs main.py, without forking"""
+    own_pid = os.getpid()
+    with os.scandir('/proc') as entries:
+        for entry in entries:
+            name = entry.name
+            if name.isdigit() and int(name) != own_pid and _runs_main_py(name):
+                return int(name)
+    return None
@@ -3,46 +3,70 @@ Configuration settings for the RugguardBot
 """
 
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def _flag(value: str) -> bool:
+    """Parse a boolean environment value such as 'true', '1' or 'yes'"""
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def _env(name: str, default: str, cast=str):
+    """Dataclass field populated from an environment variable when Config is built"""
+    return field(default_factory=lambda: cast(os.getenv(name, default)))
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Configuration class for the bot"""
+    """Configuration class for the bot, read once from the environment and immutable"""
     
-    def __init__(self):
-        # X API Configuration
-        self.X_API_KEY = os.getenv('X_API_KEY', '')
-        self.X_API_SECRET = os.getenv('X_API_SECRET', '')
-        self.X_ACCESS_TOKEN = os.getenv('X_ACCESS_TOKEN', '')
-        self.X_ACCESS_TOKEN_SECRET = os.getenv('X_ACCESS_TOKEN_SECRET', '')
-        self.X_BEARER_TOKEN = os.getenv('X_BEARER_TOKEN', '')
-        
-        # Bot Configuration
-        self.TRIGGER_PHRASE = os.getenv('TRIGGER_PHRASE', '@projectruggaurd riddle me this')
-        self.MONITORED_ACCOUNT = os.getenv('MONITORED_ACCOUNT', '')  # Empty means monitor all
-        self.POLLING_INTERVAL = int(os.getenv('POLLING_INTERVAL', '60'))  # seconds
-        
-        # Trusted Accounts Configuration
-        self.TRUSTED_ACCOUNTS_URL = os.getenv(
-            'TRUSTED_ACCOUNTS_URL', 
-            'https://raw.githubusercontent.com/devsyrem/turst-list/main/list'
-        )
-        self.TRUSTED_ACCOUNTS_UPDATE_INTERVAL = int(os.getenv('TRUSTED_ACCOUNTS_UPDATE_INTERVAL', '3600'))  # seconds
-        self.MIN_TRUSTED_FOLLOWERS = int(os.getenv('MIN_TRUSTED_FOLLOWERS', '3'))  # Changed to 3 as per bounty
-        
-        # Analysis Configuration
-        self.MAX_RECENT_TWEETS = int(os.getenv('MAX_RECENT_TWEETS', '20'))
-        self.MIN_ACCOUNT_AGE_DAYS = int(os.getenv('MIN_ACCOUNT_AGE_DAYS', '30'))
-        self.SUSPICIOUS_FOLLOWER_RATIO = float(os.getenv('SUSPICIOUS_FOLLOWER_RATIO', '10.0'))
-        
-        # Rate Limiting
-        self.API_RATE_LIMIT_WINDOW = int(os.getenv('API_RATE_LIMIT_WINDOW', '900'))  # 15 minutes
-        self.MAX_API_CALLS_PER_WINDOW = int(os.getenv('MAX_API_CALLS_PER_WINDOW', '100'))
-        
-        # Logging
-        self.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-        self.LOG_FILE = os.getenv('LOG_FILE', 'rugguard_bot.log')
+    # X API Configuration
+    X_API_KEY: str = _env('X_API_KEY', '')
+    X_API_SECRET: str = _env('X_API_SECRET', '')
+    X_ACCESS_TOKEN: str = _env('X_ACCESS_TOKEN', '')
+    X_ACCESS_TOKEN_SECRET: str = _env('X_ACCESS_TOKEN_SECRET', '')
+    X_BEARER_TOKEN: str = _env('X_BEARER_TOKEN', '')
+    
+    # Bot Configuration
+    TRIGGER_PHRASE: str = _env('TRIGGER_PHRASE', '@projectruggaurd riddle me this')
+    MONITORED_ACCOUNT: str = _env('MONITORED_ACCOUNT', '')  # Empty means monitor all
+    POLLING_INTERVAL: int = _env('POLLING_INTERVAL', '60', int)  # seconds
+    USE_FILTERED_STREAM: bool = _env('USE_FILTERED_STREAM', 'false', _flag)  # push delivery; needs filtered-stream access
+    MAX_SEARCH_PAGES: int = _env('MAX_SEARCH_PAGES', '5', int)  # 100 tweets per page
+    MONITOR_STATE_FILE: str = _env('MONITOR_STATE_FILE', 'monitor_state.json')
+    MAX_PROCESSED_TWEETS: int = _env('MAX_PROCESSED_TWEETS', '10000', int)
+    MAX_TRIGGER_RETRIES: int = _env('MAX_TRIGGER_RETRIES', '3', int)  # polls that re-fetch a failed trigger
+    
+    # Trusted Accounts Configuration
+    TRUSTED_ACCOUNTS_URL: str = _env(
+        'TRUSTED_ACCOUNTS_URL',
+        'https://raw.githubusercontent.com/devsyrem/turst-list/main/list'
+    )
+    TRUSTED_ACCOUNTS_UPDATE_INTERVAL: int = _env('TRUSTED_ACCOUNTS_UPDATE_INTERVAL', '3600', int)  # seconds
+    MIN_TRUSTED_FOLLOWERS: int = _env('MIN_TRUSTED_FOLLOWERS', '3', int)  # Changed to 3 as per bounty
+    MAX_FOLLOWER_PAGES: int = _env('MAX_FOLLOWER_PAGES', '1', int)  # 1000 newest followers per page
+    
+    # Analysis Configuration
+    MAX_RECENT_TWEETS: int = _env('MAX_RECENT_TWEETS', '20', int)
+    MIN_ACCOUNT_AGE_DAYS: int = _env('MIN_ACCOUNT_AGE_DAYS', '30', int)
+    SUSPICIOUS_FOLLOWER_RATIO: float = _env('SUSPICIOUS_FOLLOWER_RATIO', '10.0', float)
+    MAX_ANALYSIS_WORKERS: int = _env('MAX_ANALYSIS_WORKERS', '8', int)  # concurrent trigger analyses
+    DB_BATCH_SIZE: int = _env('DB_BATCH_SIZE', '32', int)  # trigger results per write transaction
+    DB_FLUSH_INTERVAL: float = _env('DB_FLUSH_INTERVAL', '0.1', float)  # seconds to wait for a fuller batch
+    SHUTDOWN_TIMEOUT: float = _env('SHUTDOWN_TIMEOUT', '30', float)  # seconds to let in-flight triggers finish on exit
+    
+    # Caching of user lookups
+    USER_CACHE_TTL: int = _env('USER_CACHE_TTL', '300', int)  # seconds
+    USER_CACHE_NEGATIVE_TTL: int = _env('USER_CACHE_NEGATIVE_TTL', '60', int)  # seconds for missing users
+    
+    # Rate Limiting
+    API_RATE_LIMIT_WINDOW: int = _env('API_RATE_LIMIT_WINDOW', '900', int)  # 15 minutes
+    MAX_API_CALLS_PER_WINDOW: int = _env('MAX_API_CALLS_PER_WINDOW', '100', int)
+    
+    # Logging
+    LOG_LEVEL: str = _env('LOG_LEVEL', 'INFO')
+    LOG_FILE: str = _env('LOG_FILE', 'rugguard_bot.log')
     
     def validate(self):
         """Validate that all required configuration is present"""
@@ -74,3 +98,8 @@ class Config:
             'access_token_secret': self.X_ACCESS_TOKEN_SECRET,
             'bearer_token': self.X_BEARER_TOKEN
         }
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Return the process-wide Config, built on first use"""
+    return Config()
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for the RugguardBot WSGI dashboard
+
+Usage: gunicorn -c gunicorn.conf.py simple_main:application
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# The dashboard is I/O-bound (process checks, log and database reads), so each
+# worker serves requests from a thread pool instead of one at a time
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+# Every worker can start the bot; bot_process serializes those starts through a lock file
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+# Only used by async worker classes; with GUNICORN_WORKER_CLASS=gevent the
+# worker monkey-patches subprocess and select, so process checks yield too
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+
+# Dashboard clients poll, so keep their connections open between requests
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
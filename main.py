@@ -13,8 +13,13 @@ if 'gunicorn' in os.environ.get('SERVER_SOFTWARE', ''):
     from simple_main import application as app
 else:
     # Regular bot execution
+    import atexit
     import time
     import logging
+    import queue
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, wait
+    from logging.handlers import QueueHandler, QueueListener
     from datetime import datetime
     from dotenv import load_dotenv
 
@@ -22,21 +27,27 @@ else:
     from bot.analyzer import AccountAnalyzer
     from bot.trusted_accounts import TrustedAccountsManager
     from bot.report_generator import ReportGenerator
-    from config import Config
+    from config import get_config
     from models import DatabaseManager
 
     # Load environment variables
     load_dotenv()
 
-    # Configure logging
+    # Configure logging; records are formatted on the calling thread and written
+    # to the file and console by a background listener, keeping I/O off the bot's threads
+    log_queue = queue.Queue(-1)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('rugguard_bot.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[QueueHandler(log_queue)]
     )
+    log_listener = QueueListener(
+        log_queue,
+        logging.FileHandler('rugguard_bot.log'),
+        logging.StreamHandler(sys.stdout)
+    )
+    log_listener.start()
+    atexit.register(log_listener.stop)
 
     logger = logging.getLogger(__name__)
 
@@ -45,13 +56,25 @@ else:
         
         def __init__(self):
             """Initialize the bot with all necessary components"""
-            self.config = Config()
+            self.config = get_config()
             self.db = DatabaseManager()
             self.monitor = XMonitor(self.config)
-            self.analyzer = AccountAnalyzer(self.config)
-            self.trusted_accounts = TrustedAccountsManager(self.config)
+            self.analyzer = AccountAnalyzer(self.config, self.monitor)
+            self.trusted_accounts = TrustedAccountsManager(self.config, self.monitor)
             self.report_generator = ReportGenerator(self.config)
             
+            # Trigger processing is network-bound, so independent triggers run concurrently
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.config.MAX_ANALYSIS_WORKERS,
+                thread_name_prefix='trigger'
+            )
+            
+            # Results are written by a background thread in batched transactions,
+            # keeping database round-trips off the trigger path
+            self.db_queue = queue.Queue()
+            self.db_writer = threading.Thread(target=self._write_results, name='db-writer', daemon=True)
+            self.db_writer.start()
+            
             logger.info("RugguardBot initialized successfully")
         
         def process_trigger(self, trigger_tweet_id, original_tweet_id, original_author_id):
@@ -73,7 +96,10 @@ else:
                     return False
                 
                 # Check trusted accounts
-                trust_score = self.trusted_accounts.check_trust_score(original_author_id)
+                trust_score = self.trusted_accounts.check_trust_score(
+                    original_author_id,
+                    analysis_result.get('username')
+                )
                 
                 # Generate report
                 report = self.report_generator.generate_report(
@@ -86,22 +112,16 @@ else:
                 success = self.monitor.post_reply(trigger_tweet_id, report)
                 
                 if success:
-                    # Save to database
-                    self.db.save_user_analysis(
+                    # Queue the analysis and processed marker for the database writer
+                    self.db_queue.put((
                         original_author_id,
                         analysis_result.get('username', 'unknown'),
                         analysis_result,
                         trust_score.get('trusted_followers_count', 0),
-                        analysis_result.get('risk_score', 50)
-                    )
-                    
-                    # Mark tweet as processed
-                    self.db.mark_tweet_processed(
+                        analysis_result.get('risk_score', 50),
                         trigger_tweet_id,
-                        original_tweet_id,
-                        original_author_id,
-                        reply_posted=True
-                    )
+                        original_tweet_id
+                    ))
                     
                     logger.info(f"Successfully processed trigger and posted reply")
                     return True
@@ -113,6 +133,62 @@ else:
                 logger.error(f"Error processing trigger: {str(e)}")
                 return False
         
+        def _write_results(self):
+            """Drain queued trigger results into the database, one transaction per batch"""
+            while True:
+                batch = [self.db_queue.get()]
+                deadline = time.monotonic() + self.config.DB_FLUSH_INTERVAL
+                
+                # Gather more results until the batch is full or the flush interval passes
+                while len(batch) < self.config.DB_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.db_queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                
+                if not self.db.save_trigger_results(batch):
+                    logger.error(f"Failed to save {len(batch)} trigger results")
+                
+                for _ in batch:
+                    self.db_queue.task_done()
+        
+        def flush(self):
+            """Block until every queued result has been written"""
+            self.db_queue.join()
+        
+        def shutdown(self):
+            """Stop accepting triggers, let submitted ones finish and persist their results"""
+            # Waited on from a helper thread so one hung API call can't hold back flushing the others
+            waiter = threading.Thread(target=self.executor.shutdown, name='executor-shutdown', daemon=True)
+            waiter.start()
+            waiter.join(self.config.SHUTDOWN_TIMEOUT)
+            if waiter.is_alive():
+                logger.warning("Triggers still running after %ss; saving the results finished so far",
+                               self.config.SHUTDOWN_TIMEOUT)
+            
+            # Only now is every finished trigger's result in the queue
+            self.flush()
+        
+        def dispatch_trigger(self, trigger):
+            """Queue a trigger for processing unless it was already handled"""
+            # Skip if already processed
+            if self.db.is_tweet_processed(trigger['trigger_tweet_id']):
+                return None
+            
+            return self.submit_trigger(trigger)
+        
+        def submit_trigger(self, trigger):
+            """Queue a trigger for processing on the worker pool"""
+            return self.executor.submit(
+                self.process_trigger,
+                trigger['trigger_tweet_id'],
+                trigger['original_tweet_id'],
+                trigger['original_author_id']
+            )
+        
         def run(self):
             """Main bot loop"""
             logger.info("Starting RugguardBot...")
@@ -120,28 +196,47 @@ else:
             # Update trusted accounts list
             self.trusted_accounts.update_trusted_list()
             
+            # Prefer push delivery; polling below is the fallback when the stream is unavailable
+            if self.config.USE_FILTERED_STREAM:
+                try:
+                    self.monitor.stream_triggers(self.dispatch_trigger)
+                except KeyboardInterrupt:
+                    logger.info("Bot stopped by user")
+                    self.shutdown()
+                    return
+                except Exception as e:
+                    logger.error(f"Filtered stream unavailable, falling back to polling: {str(e)}")
+            
             while True:
                 try:
-                    # Check for triggers
-                    triggers = self.monitor.check_for_triggers()
+                    started = time.monotonic()
+                    
+                    # Check for triggers, dispatching each page while later pages are still being fetched
+                    pending = {}  # Future -> trigger tweet ID
+                    for triggers in self.monitor.iter_trigger_pages():
+                        # One processed-check query per page instead of one per trigger
+                        processed = self.db.filter_processed([trigger['trigger_tweet_id'] for trigger in triggers])
+                        for trigger in triggers:
+                            if str(trigger['trigger_tweet_id']) not in processed:
+                                pending[self.submit_trigger(trigger)] = trigger['trigger_tweet_id']
+                    
+                    # Finish this batch before polling again
+                    wait(pending)
+                    
+                    # Failed triggers hold the position back, so the next poll retries them
+                    for future, tweet_id in pending.items():
+                        self.monitor.trigger_finished(tweet_id, future.result())
                     
-                    for trigger in triggers:
-                        # Skip if already processed
-                        if self.db.is_tweet_processed(trigger['trigger_tweet_id']):
-                            continue
-                        
-                        # Process the trigger
-                        self.process_trigger(
-                            trigger['trigger_tweet_id'],
-                            trigger['original_tweet_id'],
-                            trigger['original_author_id']
-                        )
+                    # Advance the saved since_id only once the batch's results are written
+                    self.flush()
+                    self.monitor.save_state()
                     
-                    # Wait before next check
-                    time.sleep(self.config.POLLING_INTERVAL)
+                    # Poll on a fixed cadence: the time spent processing counts toward the interval
+                    time.sleep(max(0.0, self.config.POLLING_INTERVAL - (time.monotonic() - started)))
                     
                 except KeyboardInterrupt:
                     logger.info("Bot stopped by user")
+                    self.shutdown()
                     break
                 except Exception as e:
                     logger.error(f"Unexpected error in main loop: {str(e)}")
@@ -151,7 +246,7 @@ else:
         """Main function"""
         try:
             # Validate configuration
-            config = Config()
+            config = get_config()
             if not config.validate():
                 logger.error("Configuration validation failed. Please check your environment variables.")
                 sys.exit(1)
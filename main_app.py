@@ -8,64 +8,167 @@ import os
 import json
 import threading
 import subprocess
+import time
 from datetime import datetime
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, Response, jsonify, request
+
+from bot_process import BotProcess
 
 # Create Flask app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "rugguard-bot-secret-key")
+# Dashboard CSS/JS are static files; let browsers cache them and revalidate with ETags
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+
+# API keys the bot needs before it can be started
+REQUIRED_KEYS = (
+    'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN',
+    'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'
+)
+
+# Dashboard color for each bot status; anything else (e.g. "Unknown") is orange
+STATUS_COLORS = {'Running': 'green', 'Stopped': 'red'}
+
+# Records the PID of the bot started from the dashboard, so it survives dashboard restarts
+PID_FILE = 'bot.pid'
+
+# Seconds a status check is reused, so bursts of page loads and polls share one check
+STATUS_TTL = 2.0
+
+# Seconds database statistics are reused between dashboard renders
+STATS_TTL = 10.0
+
+# Seconds between status checks on the event stream, and between keepalives when nothing changes
+STREAM_INTERVAL = 5.0
+STREAM_KEEPALIVE = 30.0
+
+def _tail(path, n=20, block=8192):
+    """Return the last n lines of a file, reading backwards from the end in blocks"""
+    with open(path, 'rb') as f:
+        offset = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        
+        # Step back one block at a time until enough lines are buffered or the start is reached
+        while offset > 0 and newlines <= n:
+            size = min(block, offset)
+            offset -= size
+            f.seek(offset)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+    
+    return b''.join(reversed(chunks)).decode('utf-8', errors='replace').splitlines()[-n:]
+
+def _clean_tail(lines):
+    """Strip log lines, dropping blanks and consecutive repeats"""
+    cleaned = []
+    prev = None
+    for line in lines:
+        line = line.strip()
+        if line and line != prev:
+            cleaned.append(line)
+            prev = line
+    return cleaned
 
 class RugguardBotManager:
     def __init__(self):
         self.bot_status = "Stopped"
         self.bot_logs = []
         self.config_status = "Not Configured"
+        self._log_signature = None  # (mtime_ns, size) of the log when bot_logs was last read
+        self._missing_keys = None  # Environment doesn't change at runtime, so check it once
+        self.bot = BotProcess(pid_file=PID_FILE)
+        self._status_cache_until = 0.0
+        self._status_lock = threading.Lock()
+        self._db = None  # DatabaseManager, opened on first use
+        self._stats = None
+        self._stats_ts = 0.0
         self.update_status()
         
     def update_status(self):
         """Update bot status by checking if the RugguardBot process is running"""
+        now = time.monotonic()
+        if now < self._status_cache_until:
+            return
+        
+        # Only one request runs the check; concurrent ones serve the current state instead of queueing behind it
+        if not self._status_lock.acquire(blocking=False):
+            return
         try:
-            result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-            if result.returncode == 0:
+            self._status_cache_until = now + STATUS_TTL
+            self._refresh_status()
+        finally:
+            self._status_lock.release()
+    
+    def _refresh_status(self):
+        """Check the bot process and re-read its log tail"""
+        try:
+            if self.is_bot_running():
                 self.bot_status = "Running"
                 try:
-                    with open('rugguard_bot.log', 'r') as f:
-                        lines = f.readlines()
-                        self.bot_logs = [line.strip() for line in lines[-20:] if line.strip()]
+                    st = os.stat('rugguard_bot.log')
+                    signature = (st.st_mtime_ns, st.st_size)
+                    # Only re-read the tail when the log has changed since the last read
+                    if signature != self._log_signature:
+                        self.bot_logs = _clean_tail(_tail('rugguard_bot.log', 20))
+                        self._log_signature = signature
                 except FileNotFoundError:
                     self.bot_logs = ["Bot is running but log file not found"]
+                    self._log_signature = None
             else:
                 self.bot_status = "Stopped"
                 self.bot_logs = []
+                self._log_signature = None
         except Exception as e:
             self.bot_status = "Unknown"
             self.bot_logs = [f"Error checking status: {str(e)}"]
+            self._log_signature = None
         
+    def is_bot_running(self):
+        """Check whether the bot process is alive"""
+        return self.bot.is_running()
+    
+    def start_bot(self):
+        """Launch the bot unless it is already running; returns False if it was"""
+        started = self.bot.start()
+        self._status_cache_until = 0.0
+        return started
+    
+    def stop_bot(self):
+        """Stop the tracked bot process; returns False if no process is tracked"""
+        stopped = self.bot.stop()
+        self._status_cache_until = 0.0
+        return stopped
+    
     def check_configuration(self):
         """Check if API keys are configured"""
-        required_keys = [
-            'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN', 
-            'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'
-        ]
-        
-        missing_keys = []
-        for key in required_keys:
-            if not os.environ.get(key):
-                missing_keys.append(key)
+        if self._missing_keys is None:
+            self._missing_keys = [key for key in REQUIRED_KEYS if not os.environ.get(key)]
         
-        if missing_keys:
-            self.config_status = f"Missing: {', '.join(missing_keys)}"
+        if self._missing_keys:
+            self.config_status = f"Missing: {', '.join(self._missing_keys)}"
             return False
         else:
             self.config_status = "Configured"
             return True
+    
+    def invalidate_config_cache(self):
+        """Re-read the API keys from the environment on the next configuration check"""
+        self._missing_keys = None
 
     def get_database_stats(self):
-        """Get database statistics"""
+        """Get database statistics, cached for STATS_TTL seconds"""
+        if self._stats is not None and time.monotonic() - self._stats_ts < STATS_TTL:
+            return self._stats
+        
         try:
-            from models import DatabaseManager
-            db = DatabaseManager()
-            return db.get_stats()
+            if self._db is None:
+                from models import DatabaseManager
+                self._db = DatabaseManager()
+            self._stats = self._db.get_stats()
+            self._stats_ts = time.monotonic()
+            return self._stats
         except Exception:
             return {
                 'total_analyses': 0,
@@ -77,55 +180,16 @@ class RugguardBotManager:
 # Initialize bot manager
 bot_manager = RugguardBotManager()
 
-@app.route('/')
-def dashboard():
-    """Main dashboard page"""
-    bot_manager.update_status()
-    config_ok = bot_manager.check_configuration()
-    db_stats = bot_manager.get_database_stats()
-    
-    status_color = 'green' if bot_manager.bot_status == 'Running' else 'red' if bot_manager.bot_status == 'Stopped' else 'orange'
-    config_color = 'green' if config_ok else 'red'
-    
-    template = """
+# The dashboard template is compiled once here rather than re-parsed on every request
+app.jinja_env.auto_reload = False
+DASHBOARD_TEMPLATE = app.jinja_env.from_string("""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>RugguardBot - X Account Analyzer</title>
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f5f5f5; color: #333; }
-            .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-            .header { text-align: center; margin-bottom: 40px; }
-            .header h1 { font-size: 2.5rem; color: #2563eb; margin-bottom: 8px; }
-            .header p { font-size: 1.2rem; color: #64748b; }
-            .cards { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin-bottom: 30px; }
-            .card { background: white; padding: 24px; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
-            .card h3 { font-size: 1.1rem; margin-bottom: 16px; display: flex; align-items: center; justify-content: space-between; }
-            .status-dot { width: 12px; height: 12px; border-radius: 50%; }
-            .status-green { background: #10b981; }
-            .status-red { background: #ef4444; }
-            .status-orange { background: #f59e0b; }
-            .status-text { font-size: 1.5rem; font-weight: bold; margin-bottom: 16px; }
-            .text-green { color: #10b981; }
-            .text-red { color: #ef4444; }
-            .text-orange { color: #f59e0b; }
-            .btn { padding: 10px 20px; border: none; border-radius: 6px; cursor: pointer; font-size: 0.9rem; font-weight: 500; }
-            .btn-green { background: #10b981; color: white; }
-            .btn-red { background: #ef4444; color: white; }
-            .btn-blue { background: #2563eb; color: white; }
-            .btn:hover { opacity: 0.9; }
-            .btn:disabled { background: #9ca3af; cursor: not-allowed; }
-            .stats { display: flex; flex-direction: column; gap: 8px; }
-            .stat-row { display: flex; justify-content: space-between; }
-            .logs { background: #f8f9fa; padding: 16px; border-radius: 8px; max-height: 300px; overflow-y: auto; margin-bottom: 16px; }
-            .log-entry { font-family: 'Courier New', monospace; font-size: 0.85rem; margin-bottom: 4px; color: #374151; }
-            .how-it-works { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; text-align: center; }
-            .step { padding: 20px; }
-            .step-icon { font-size: 2rem; margin-bottom: 12px; }
-        </style>
+        <link rel="stylesheet" href="{{ url_for('static', filename='dashboard.css') }}">
     </head>
     <body>
         <div class="container">
@@ -207,56 +271,28 @@ def dashboard():
             </div>
         </div>
 
-        <script>
-            async function startBot() {
-                try {
-                    const response = await fetch('/api/start', { method: 'POST' });
-                    const data = await response.json();
-                    alert(data.message);
-                    if (data.success) {
-                        setTimeout(() => window.location.reload(), 2000);
-                    }
-                } catch (error) {
-                    alert('Error starting bot: ' + error.message);
-                }
-            }
-
-            async function stopBot() {
-                try {
-                    const response = await fetch('/api/stop', { method: 'POST' });
-                    const data = await response.json();
-                    alert(data.message);
-                    if (data.success) {
-                        setTimeout(() => window.location.reload(), 2000);
-                    }
-                } catch (error) {
-                    alert('Error stopping bot: ' + error.message);
-                }
-            }
-
-            function refreshLogs() {
-                window.location.reload();
-            }
-
-            setInterval(() => {
-                fetch('/api/status')
-                    .then(response => response.json())
-                    .then(data => console.log('Status updated:', data.status))
-                    .catch(error => console.error('Status update failed:', error));
-            }, 30000);
-        </script>
+        <script src="{{ url_for('static', filename='dashboard.js') }}"></script>
     </body>
     </html>
-    """
+""")
+
+@app.route('/')
+def dashboard():
+    """Main dashboard page"""
+    bot_manager.update_status()
+    config_ok = bot_manager.check_configuration()
+    db_stats = bot_manager.get_database_stats()
     
-    return render_template_string(template, 
-                                bot_status=bot_manager.bot_status,
-                                config_ok=config_ok,
-                                config_status=bot_manager.config_status,
-                                bot_logs=bot_manager.bot_logs,
-                                db_stats=db_stats,
-                                status_color=status_color,
-                                config_color=config_color)
+    status_color = STATUS_COLORS.get(bot_manager.bot_status, 'orange')
+    config_color = 'green' if config_ok else 'red'
+    
+    return DASHBOARD_TEMPLATE.render(bot_status=bot_manager.bot_status,
+                                     config_ok=config_ok,
+                                     config_status=bot_manager.config_status,
+                                     bot_logs=bot_manager.bot_logs,
+                                     db_stats=db_stats,
+                                     status_color=status_color,
+                                     config_color=config_color)
 
 @app.route('/api/status')
 def api_status():
@@ -268,6 +304,28 @@ def api_status():
         'logs': bot_manager.bot_logs[-10:]
     })
 
+@app.route('/api/status/stream')
+def api_status_stream():
+    """Server-sent events stream that pushes the status only when it changes"""
+    def generate():
+        last = None
+        last_sent = time.monotonic()
+        while True:
+            bot_manager.update_status()
+            current = (bot_manager.bot_status, bot_manager.config_status)
+            if current != last:
+                yield f"data: {json.dumps({'status': current[0], 'config': current[1]})}\n\n"
+                last = current
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= STREAM_KEEPALIVE:
+                # Writing a comment line lets the server notice clients that have gone away
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+            time.sleep(STREAM_INTERVAL)
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/start', methods=['POST'])
 def api_start():
     """Start the bot"""
@@ -278,20 +336,12 @@ def api_start():
         })
     
     try:
-        result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-        if result.returncode == 0:
+        if not bot_manager.start_bot():
             return jsonify({
                 'message': 'Bot is already running',
                 'success': True
             })
         
-        def start_bot():
-            subprocess.Popen(['python', 'main.py'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        
-        thread = threading.Thread(target=start_bot)
-        thread.daemon = True
-        thread.start()
-        
         return jsonify({
             'message': 'Bot startup initiated - check logs for status',
             'success': True
@@ -307,7 +357,9 @@ def api_start():
 def api_stop():
     """Stop the bot"""
     try:
-        subprocess.run(['pkill', '-f', 'main.py'], capture_output=True, text=True)
+        # Pattern-matching pkill is only needed for a bot the dashboard didn't start
+        if not bot_manager.stop_bot():
+            subprocess.run(['pkill', '-f', 'main.py'], capture_output=True, text=True)
         return jsonify({
             'message': 'Bot stop signal sent',
             'success': True
@@ -319,4 +371,4 @@ def api_stop():
         })
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
\ No newline at end of file
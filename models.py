@@ -3,26 +3,71 @@ Database Models for RugguardBot
 """
 
 import os
+import queue
 import sqlite3
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Any
 import threading
 
+try:
+    import orjson
+except ImportError:  # Optional: faster analysis_data serialization; the json module is used without it
+    orjson = None
+
+def _dumps(data: Any) -> str:
+    """Serialize analysis data for a TEXT column"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data)
+
+def _loads(text: str) -> Any:
+    """Deserialize analysis data stored by _dumps"""
+    return orjson.loads(text) if orjson else json.loads(text)
+
 class DatabaseManager:
     """SQLite database manager for RugguardBot"""
     
+    STATS_TTL = 10.0  # seconds get_stats results are reused
+    LOG_BATCH_SIZE = 500  # bot_logs rows per write transaction
+    LOG_FLUSH_INTERVAL = 0.2  # seconds to wait for a fuller log batch
+    
     def __init__(self, db_path: str = "rugguard_bot.db"):
         self.db_path = db_path
         self.lock = threading.Lock()
+        self._local = threading.local()  # One connection per thread, reused across calls
+        self._stats = None
+        self._stats_expires = 0.0
+        self._log_queue = queue.Queue()
+        self._log_writer = None  # Started by the first log_event
         self.init_database()
     
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            # These settings are per connection, so they are applied to each one
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA mmap_size=268435456')  # 256 MB
+            conn.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
+            self._local.conn = conn
+        elif conn.in_transaction:
+            # Discard anything left uncommitted by a call that failed part way
+            conn.rollback()
+        return conn
+    
     def init_database(self):
         """Initialize database tables"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._conn()
             cursor = conn.cursor()
             
+            # Lets cleanup_old_data return freed pages to the OS; only takes effect on a new database
+            cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            
             # Create tables
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS user_analyses (
@@ -73,36 +118,73 @@ class DatabaseManager:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_tweet_id ON processed_tweets(tweet_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_username ON trusted_accounts_cache(username)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_log_level ON bot_logs(level)')
+            # Time-range filters in get_stats, get_recent_logs and cleanup_old_data;
+            # per-user lookups already use the UNIQUE(user_id, analyzed_at) index
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ua_time ON user_analyses(analyzed_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_pt_processed ON processed_tweets(processed_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_log_created ON bot_logs(created_at)')
+            
+            # WAL lets dashboard reads proceed during bot writes; NORMAL sync (set in _conn) is safe under WAL
+            cursor.execute('PRAGMA journal_mode=WAL')
             
             conn.commit()
-            conn.close()
     
     def save_user_analysis(self, user_id: str, username: str, analysis_data: Dict, 
                           trust_score: float = 0.0, risk_score: float = 0.0) -> bool:
         """Save user analysis to database"""
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
+                conn = self._conn()
                 cursor = conn.cursor()
                 
                 cursor.execute('''
                     INSERT INTO user_analyses 
                     (user_id, username, analysis_data, trust_score, risk_score)
                     VALUES (?, ?, ?, ?, ?)
-                ''', (user_id, username, json.dumps(analysis_data), trust_score, risk_score))
+                ''', (user_id, username, _dumps(analysis_data), trust_score, risk_score))
                 
                 conn.commit()
-                conn.close()
                 return True
         except Exception as e:
             print(f"Error saving user analysis: {e}")
             return False
     
+    def save_trigger_results(self, results: List[tuple]) -> bool:
+        """
+        Save analyses and mark their trigger tweets processed in one transaction
+        
+        Args:
+            results: (user_id, username, analysis_data, trust_score, risk_score,
+                tweet_id, original_tweet_id) tuples, one per answered trigger
+        """
+        try:
+            with self.lock:
+                conn = self._conn()
+                with conn:
+                    # Latest analysis wins if a user is analyzed twice within the same second
+                    conn.executemany('''
+                        INSERT OR REPLACE INTO user_analyses 
+                        (user_id, username, analysis_data, trust_score, risk_score)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', [
+                        (user_id, username, _dumps(analysis_data), trust_score, risk_score)
+                        for user_id, username, analysis_data, trust_score, risk_score, _, _ in results
+                    ])
+                    
+                    self._insert_processed(conn, [
+                        (tweet_id, original_tweet_id or '', user_id or '', '', True)
+                        for user_id, _, _, _, _, tweet_id, original_tweet_id in results
+                    ])
+                return True
+        except Exception as e:
+            print(f"Error saving trigger results: {e}")
+            return False
+    
     def get_user_analysis(self, user_id: str, max_age_hours: int = 24) -> Optional[Dict]:
         """Get recent user analysis from database"""
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
+                conn = self._conn()
                 cursor = conn.cursor()
                 
                 cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
@@ -114,11 +196,10 @@ class DatabaseManager:
                 ''', (user_id, cutoff_time))
                 
                 result = cursor.fetchone()
-                conn.close()
                 
                 if result:
                     return {
-                        'analysis_data': json.loads(result[0]),
+                        'analysis_data': _loads(result[0]),
                         'trust_score': result[1],
                         'risk_score': result[2],
                         'analyzed_at': result[3]
@@ -134,57 +215,100 @@ class DatabaseManager:
         """Mark tweet as processed"""
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO processed_tweets 
-                    (tweet_id, original_tweet_id, original_author_id, trigger_user_id, reply_posted)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (tweet_id, original_tweet_id or '', original_author_id or '', trigger_user_id or '', reply_posted))
+                conn = self._conn()
+                self._insert_processed(conn, [
+                    (tweet_id, original_tweet_id or '', original_author_id or '', trigger_user_id or '', reply_posted)
+                ])
                 
                 conn.commit()
-                conn.close()
                 return True
         except Exception as e:
             print(f"Error marking tweet as processed: {e}")
             return False
     
+    @staticmethod
+    def _insert_processed(conn, rows: List[tuple]):
+        """
+        Insert processed_tweets markers for a caller that holds the lock
+        
+        Args:
+            rows: (tweet_id, original_tweet_id, original_author_id, trigger_user_id, reply_posted) tuples
+        """
+        # Ignore rather than replace: a duplicate marker needs no delete-and-reinsert
+        conn.executemany('''
+            INSERT OR IGNORE INTO processed_tweets 
+            (tweet_id, original_tweet_id, original_author_id, trigger_user_id, reply_posted)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        
+        # An existing marker only changes when a reply has since been posted
+        conn.executemany(
+            'UPDATE processed_tweets SET reply_posted = 1 WHERE tweet_id = ? AND reply_posted = 0',
+            [(row[0],) for row in rows if row[4]]
+        )
+    
     def is_tweet_processed(self, tweet_id: str) -> bool:
         """Check if tweet has been processed"""
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
+                conn = self._conn()
                 cursor = conn.cursor()
                 
                 cursor.execute('SELECT 1 FROM processed_tweets WHERE tweet_id = ?', (tweet_id,))
                 result = cursor.fetchone()
-                conn.close()
                 
                 return result is not None
         except Exception as e:
             print(f"Error checking if tweet processed: {e}")
             return False
     
-    def cache_trusted_accounts(self, accounts: List[str]) -> bool:
-        """Cache trusted accounts list"""
+    def filter_processed(self, tweet_ids: List[str]) -> Set[str]:
+        """
+        Find which of the given tweets have already been processed
+        
+        Args:
+            tweet_ids: Tweet IDs to check
+        
+        Returns:
+            Set of the processed tweet IDs, as strings
+        """
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
+                conn = self._conn()
                 cursor = conn.cursor()
                 
-                # Clear old cache
-                cursor.execute('DELETE FROM trusted_accounts_cache')
+                processed = set()
+                ids = [str(tweet_id) for tweet_id in tweet_ids]
                 
-                # Insert new accounts
-                for username in accounts:
+                # Chunked to stay under SQLite's bound-parameter limit
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
                     cursor.execute(
-                        'INSERT INTO trusted_accounts_cache (username) VALUES (?)',
-                        (username.strip(),)
+                        f'SELECT tweet_id FROM processed_tweets WHERE tweet_id IN ({",".join("?" * len(chunk))})',
+                        chunk
                     )
+                    processed.update(row[0] for row in cursor.fetchall())
                 
-                conn.commit()
-                conn.close()
+                return processed
+        except Exception as e:
+            print(f"Error filtering processed tweets: {e}")
+            return set()
+    
+    def cache_trusted_accounts(self, accounts: List[str]) -> bool:
+        """Cache trusted accounts list"""
+        try:
+            with self.lock:
+                conn = self._conn()
+                # Replace the cache in a single transaction
+                with conn:
+                    # Clear old cache
+                    conn.execute('DELETE FROM trusted_accounts_cache')
+                    
+                    # Insert new accounts; duplicates in the list are skipped
+                    conn.executemany(
+                        'INSERT OR IGNORE INTO trusted_accounts_cache (username) VALUES (?)',
+                        [(username.strip(),) for username in accounts]
+                    )
                 return True
         except Exception as e:
             print(f"Error caching trusted accounts: {e}")
@@ -194,12 +318,11 @@ class DatabaseManager:
         """Get cached trusted accounts"""
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
+                conn = self._conn()
                 cursor = conn.cursor()
                 
                 cursor.execute('SELECT username FROM trusted_accounts_cache')
                 results = cursor.fetchall()
-                conn.close()
                 
                 return [row[0] for row in results]
         except Exception as e:
@@ -207,29 +330,61 @@ class DatabaseManager:
             return []
     
     def log_event(self, level: str, message: str, module: Optional[str] = None) -> bool:
-        """Log bot events to database"""
+        """Queue a bot event for the background log writer"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO bot_logs (level, message, module)
-                    VALUES (?, ?, ?)
-                ''', (level, message, module))
-                
-                conn.commit()
-                conn.close()
-                return True
+            if self._log_writer is None:
+                with self.lock:
+                    if self._log_writer is None:
+                        self._log_writer = threading.Thread(target=self._write_logs, name='db-log-writer', daemon=True)
+                        self._log_writer.start()
+            
+            # Stamped now, in the same UTC format as the column default, since the row is written later
+            created_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            self._log_queue.put((level, message, module, created_at))
+            return True
         except Exception as e:
             print(f"Error logging event: {e}")
             return False
     
+    def _write_logs(self):
+        """Drain queued log events into bot_logs, one transaction per batch"""
+        while True:
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + self.LOG_FLUSH_INTERVAL
+            
+            # Gather more events until the batch is full or the flush interval passes
+            while len(batch) < self.LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                with self.lock:
+                    conn = self._conn()
+                    with conn:
+                        conn.executemany('''
+                            INSERT INTO bot_logs (level, message, module, created_at)
+                            VALUES (?, ?, ?, ?)
+                        ''', batch)
+            except Exception as e:
+                print(f"Error writing {len(batch)} log events: {e}")
+            
+            for _ in batch:
+                self._log_queue.task_done()
+    
+    def flush(self):
+        """Block until every queued log event has been written"""
+        self._log_queue.join()
+    
     def get_recent_logs(self, limit: int = 50) -> List[Dict]:
         """Get recent bot logs"""
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
+                conn = self._conn()
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -239,7 +394,6 @@ class DatabaseManager:
                 ''', (limit,))
                 
                 results = cursor.fetchall()
-                conn.close()
                 
                 return [
                     {
@@ -255,37 +409,34 @@ class DatabaseManager:
             return []
     
     def get_stats(self) -> Dict:
-        """Get bot statistics"""
+        """Get bot statistics, cached for STATS_TTL seconds"""
         try:
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
+                if self._stats is not None and time.monotonic() < self._stats_expires:
+                    return dict(self._stats)
                 
-                # Total analyses
-                cursor.execute('SELECT COUNT(*) FROM user_analyses')
-                total_analyses = cursor.fetchone()[0]
+                conn = self._conn()
+                cursor = conn.cursor()
                 
-                # Recent analyses (last 24 hours)
+                # All four counts in one statement
                 cutoff_time = datetime.now() - timedelta(hours=24)
-                cursor.execute('SELECT COUNT(*) FROM user_analyses WHERE analyzed_at > ?', (cutoff_time,))
-                recent_analyses = cursor.fetchone()[0]
-                
-                # Total processed tweets
-                cursor.execute('SELECT COUNT(*) FROM processed_tweets')
-                total_tweets = cursor.fetchone()[0]
-                
-                # Trusted accounts count
-                cursor.execute('SELECT COUNT(*) FROM trusted_accounts_cache')
-                trusted_accounts = cursor.fetchone()[0]
-                
-                conn.close()
+                cursor.execute('''
+                    SELECT
+                        (SELECT COUNT(*) FROM user_analyses),
+                        (SELECT COUNT(*) FROM user_analyses WHERE analyzed_at > ?),
+                        (SELECT COUNT(*) FROM processed_tweets),
+                        (SELECT COUNT(*) FROM trusted_accounts_cache)
+                ''', (cutoff_time,))
+                total_analyses, recent_analyses, total_tweets, trusted_accounts = cursor.fetchone()
                 
-                return {
+                self._stats = {
                     'total_analyses': total_analyses,
                     'recent_analyses': recent_analyses,
                     'total_tweets': total_tweets,
                     'trusted_accounts': trusted_accounts
                 }
+                self._stats_expires = time.monotonic() + self.STATS_TTL
+                return dict(self._stats)
         except Exception as e:
             print(f"Error getting stats: {e}")
             return {
@@ -295,27 +446,37 @@ class DatabaseManager:
                 'trusted_accounts': 0
             }
     
-    def cleanup_old_data(self, days: int = 30) -> bool:
-        """Clean up old data from database"""
+    def cleanup_old_data(self, days: int = 30, batch_size: int = 1000) -> bool:
+        """
+        Clean up old data from database
+        
+        Rows are deleted batch_size at a time, each batch in its own short
+        transaction, so bot writes are never blocked for long.
+        """
         try:
+            cutoff_time = datetime.now() - timedelta(days=days)
+            
+            # Old analyses, processed tweets and logs
+            for table, column in (('user_analyses', 'analyzed_at'),
+                                  ('processed_tweets', 'processed_at'),
+                                  ('bot_logs', 'created_at')):
+                while True:
+                    with self.lock:
+                        conn = self._conn()
+                        with conn:
+                            deleted = conn.execute(
+                                f'DELETE FROM {table} WHERE rowid IN '
+                                f'(SELECT rowid FROM {table} WHERE {column} < ? LIMIT ?)',
+                                (cutoff_time, batch_size)
+                            ).rowcount
+                    if deleted < batch_size:
+                        break
+            
+            # Release freed pages; a no-op unless the database uses incremental auto_vacuum.
+            # executescript runs the pragma to completion, where execute() frees only one page
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                cutoff_time = datetime.now() - timedelta(days=days)
-                
-                # Clean old analyses
-                cursor.execute('DELETE FROM user_analyses WHERE analyzed_at < ?', (cutoff_time,))
-                
-                # Clean old processed tweets
-                cursor.execute('DELETE FROM processed_tweets WHERE processed_at < ?', (cutoff_time,))
-                
-                # Clean old logs
-                cursor.execute('DELETE FROM bot_logs WHERE created_at < ?', (cutoff_time,))
-                
-                conn.commit()
-                conn.close()
-                return True
+                self._conn().executescript('PRAGMA incremental_vacuum(1000);')
+            return True
         except Exception as e:
             print(f"Error cleaning up old data: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -4,7 +4,11 @@ Simple Flask implementation for RugguardBot
 """
 
 import os
+import zlib
+import html
 import json
+import mmap
+import subprocess
 import threading
 import time
 from datetime import datetime
@@ -12,46 +16,386 @@ import http.server
 import socketserver
 from urllib.parse import urlparse, parse_qs
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON responses; the json module is used without it
+    orjson = None
+
+from bot_process import BotProcess
+
+def _dumps(data):
+    """Serialize a response payload to JSON bytes"""
+    return orjson.dumps(data) if orjson else json.dumps(data).encode()
+
+# Seconds a status check is reused across requests
+CACHE_TTL = 2.0
+
+# Seconds between status checks on an idle /api/events stream, and between its keepalives
+EVENT_INTERVAL = 5.0
+EVENT_KEEPALIVE = 30.0
+
+# API keys the bot needs before it can be started
+_REQUIRED_KEYS = (
+    'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN',
+    'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'
+)
+
+# Shown in the activity log panel until the bot has written any logs
+_EMPTY_LOGS_HTML = '<div class="text-center text-green-400 py-8"><div class="text-4xl mb-2">🚀</div><div>Bot logs will appear here once started</div><div class="text-xs mt-2 opacity-70">Configure API keys and start the bot to see real-time activity</div></div>'
+
+# Static parts of the dashboard page; only the fragment between them is built per request
+_HTML_HEAD = """
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>RugguardBot - X Account Analyzer</title>
+            <script src="https://cdn.tailwindcss.com"></script>
+            <script>
+                tailwind.config = {
+                    theme: {
+                        extend: {
+                            colors: {
+                                'primary': '#3b82f6',
+                                'primary-dark': '#1e40af',
+                                'secondary': '#64748b',
+                                'accent': '#06b6d4',
+                                'success': '#10b981',
+                                'warning': '#f59e0b',
+                                'error': '#ef4444'
+                            },
+                            animation: {
+                                'pulse-slow': 'pulse 3s infinite',
+                                'bounce-slow': 'bounce 2s infinite'
+                            }
+                        }
+                    }
+                }
+            </script>
+            <link rel="preconnect" href="https://fonts.googleapis.com">
+            <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+            <style>
+                body { font-family: 'Inter', sans-serif; }
+                .gradient-bg { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }
+                .card-shadow { box-shadow: 0 10px 25px -5px rgba(0, 0, 0, 0.1), 0 10px 10px -5px rgba(0, 0, 0, 0.04); }
+                .glass { backdrop-filter: blur(16px) saturate(180%); background-color: rgba(255, 255, 255, 0.75); border: 1px solid rgba(209, 213, 219, 0.3); }
+                .status-indicator { position: relative; display: inline-block; }
+                .status-indicator::before { content: ''; position: absolute; top: 50%; left: -12px; transform: translateY(-50%); width: 8px; height: 8px; border-radius: 50%; }
+                .status-success::before { background-color: #10b981; box-shadow: 0 0 6px #10b981; }
+                .status-warning::before { background-color: #f59e0b; box-shadow: 0 0 6px #f59e0b; }
+                .status-error::before { background-color: #ef4444; box-shadow: 0 0 6px #ef4444; }
+                .terminal { background: linear-gradient(145deg, #1a1a1a, #2d2d2d); color: #00ff41; font-family: 'Monaco', 'Menlo', monospace; }
+                .metric-card { transition: all 0.3s ease; }
+                .metric-card:hover { transform: translateY(-2px); }
+            </style>
+        </head>
+        <body class="min-h-screen gradient-bg">
+            <div class="min-h-screen py-8 px-4">
+                <!-- Header -->
+                <div class="max-w-6xl mx-auto mb-8">
+                    <div class="text-center text-white">
+                        <div class="inline-flex items-center justify-center w-20 h-20 bg-white/20 rounded-full mb-4 backdrop-blur-lg">
+                            <span class="text-4xl">🛡️</span>
+                        </div>
+                        <h1 class="text-5xl font-bold mb-2">RugguardBot</h1>
+                        <p class="text-xl text-white/80 font-medium">Advanced X Account Trustworthiness Analyzer</p>
+                        <div class="w-24 h-1 bg-gradient-to-r from-accent to-primary mx-auto mt-4 rounded-full"></div>
+                    </div>
+                </div>
+
+"""
+
+_SETUP_GUIDE_HTML = """
+                    <!-- Setup Instructions -->
+                    <div>
+                        <div class="glass rounded-2xl p-6 card-shadow">
+                            <h2 class="text-xl font-bold text-gray-800 mb-4 flex items-center">
+                                <span class="text-2xl mr-2">⚙️</span>
+                                Setup Guide
+                            </h2>
+                            <div class="space-y-4">
+                                <p class="text-gray-600">Get your X API credentials to start analyzing accounts:</p>
+                                <div class="bg-blue-50 border-l-4 border-primary p-4 rounded-lg">
+                                    <ol class="space-y-2 text-sm">
+                                        <li class="flex items-start">
+                                            <span class="bg-primary text-white w-5 h-5 rounded-full flex items-center justify-center text-xs mr-2 mt-0.5 font-bold">1</span>
+                                            <span>Visit <a href="https://developer.twitter.com" target="_blank" class="text-primary hover:text-primary-dark font-medium underline">Twitter Developer Portal</a></span>
+                                        </li>
+                                        <li class="flex items-start">
+                                            <span class="bg-primary text-white w-5 h-5 rounded-full flex items-center justify-center text-xs mr-2 mt-0.5 font-bold">2</span>
+                                            <span>Create an app and generate API keys</span>
+                                        </li>
+                                        <li class="flex items-start">
+                                            <span class="bg-primary text-white w-5 h-5 rounded-full flex items-center justify-center text-xs mr-2 mt-0.5 font-bold">3</span>
+                                            <span>Add these secrets to your Replit environment:</span>
+                                        </li>
+                                    </ol>
+                                </div>
+                                <div class="grid grid-cols-1 gap-2 text-xs">
+                                    <div class="bg-gray-100 rounded p-2 font-mono">X_API_KEY</div>
+                                    <div class="bg-gray-100 rounded p-2 font-mono">X_API_SECRET</div>
+                                    <div class="bg-gray-100 rounded p-2 font-mono">X_ACCESS_TOKEN</div>
+                                    <div class="bg-gray-100 rounded p-2 font-mono">X_ACCESS_TOKEN_SECRET</div>
+                                    <div class="bg-gray-100 rounded p-2 font-mono">X_BEARER_TOKEN</div>
+                                </div>
+                            </div>
+                        </div>
+                    </div>
+
+"""
+
+_HTML_TAIL = """
+                </div>
+            </div>
+            
+            <script>
+                // Show toast notifications instead of alerts
+                function showToast(message, type = 'info') {
+                    const toast = document.createElement('div');
+                    toast.className = `fixed top-4 right-4 z-50 px-6 py-3 rounded-lg shadow-lg transform transition-all duration-300 translate-x-full`;
+                    
+                    const colors = {
+                        'success': 'bg-green-500 text-white',
+                        'error': 'bg-red-500 text-white',
+                        'info': 'bg-blue-500 text-white',
+                        'warning': 'bg-yellow-500 text-white'
+                    };
+                    
+                    toast.className += ` ${colors[type] || colors.info}`;
+                    toast.textContent = message;
+                    
+                    document.body.appendChild(toast);
+                    
+                    setTimeout(() => {
+                        toast.style.transform = 'translateX(0)';
+                    }, 100);
+                    
+                    setTimeout(() => {
+                        toast.style.transform = 'translateX(100%)';
+                        setTimeout(() => document.body.removeChild(toast), 300);
+                    }, 3000);
+                }
+
+                function startBot() {
+                    const button = document.querySelector('[onclick="startBot()"]');
+                    const originalText = button.innerHTML;
+                    button.innerHTML = '<span class="animate-spin">⏳</span> <span>Starting...</span>';
+                    button.disabled = true;
+                    
+                    fetch('/api/start', {method: 'POST'})
+                        .then(r => r.json())
+                        .then(data => {
+                            showToast(data.message, data.success !== false ? 'success' : 'error');
+                            setTimeout(refreshStatus, 1000);
+                        })
+                        .catch(e => {
+                            showToast('Failed to start bot: ' + e.message, 'error');
+                        })
+                        .finally(() => {
+                            button.innerHTML = originalText;
+                            button.disabled = false;
+                        });
+                }
+                
+                function stopBot() {
+                    const button = document.querySelector('[onclick="stopBot()"]');
+                    const originalText = button.innerHTML;
+                    button.innerHTML = '<span class="animate-spin">⏳</span> <span>Stopping...</span>';
+                    button.disabled = true;
+                    
+                    fetch('/api/stop', {method: 'POST'})
+                        .then(r => r.json())
+                        .then(data => {
+                            showToast(data.message, 'success');
+                            setTimeout(refreshStatus, 1000);
+                        })
+                        .catch(e => {
+                            showToast('Failed to stop bot: ' + e.message, 'error');
+                        })
+                        .finally(() => {
+                            button.innerHTML = originalText;
+                            button.disabled = false;
+                        });
+                }
+                
+                function refreshStatus() {
+                    const button = document.querySelector('[onclick="refreshStatus()"]');
+                    const originalText = button.innerHTML;
+                    button.innerHTML = '<span class="animate-spin">🔄</span> <span>Refreshing...</span>';
+                    
+                    setTimeout(() => {
+                        location.reload();
+                    }, 500);
+                }
+                
+                // Update status indicators without full page reload
+                function showStatus(data) {
+                    const statusElements = document.querySelectorAll('[data-status]');
+                    statusElements.forEach(el => {
+                        if (el.dataset.status === 'bot') {
+                            el.textContent = data.status;
+                        }
+                    });
+                }
+                
+                // Status changes are pushed by the server; poll every 30 seconds only without EventSource
+                if (window.EventSource) {
+                    new EventSource('/api/events').onmessage = e => showStatus(JSON.parse(e.data));
+                } else {
+                    setInterval(() => {
+                        fetch('/api/status')
+                            .then(r => r.json())
+                            .then(showStatus)
+                            .catch(() => {
+                                // Silent fail for auto-refresh
+                            });
+                    }, 30000);
+                }
+
+                // Add smooth transitions and interactions
+                document.addEventListener('DOMContentLoaded', function() {
+                    // Add hover effects to metric cards
+                    const metricCards = document.querySelectorAll('.metric-card');
+                    metricCards.forEach(card => {
+                        card.addEventListener('mouseenter', function() {
+                            this.style.transform = 'translateY(-4px) scale(1.02)';
+                        });
+                        card.addEventListener('mouseleave', function() {
+                            this.style.transform = 'translateY(0) scale(1)';
+                        });
+                    });
+                });
+            </script>
+        </body>
+        </html>
+        """
+
+def _read_log_tail(path, n=20):
+    """Return the last n lines of a log, found by scanning a memory map backwards for newlines"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        
+        # Only the pages holding the tail are faulted in
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = size - 1 if mm[size - 1] == 0x0A else size  # Ignore the trailing newline
+            start = 0
+            for _ in range(n):
+                newline = mm.rfind(b'\n', 0, end)
+                if newline < 0:
+                    break
+                end = newline
+            else:
+                start = end + 1
+            return mm[start:size].decode('utf-8', errors='replace').splitlines()
+
 class RugguardBotServer:
     def __init__(self, port=5000):
         self.port = port
         self.bot_status = "Stopped"
         self.bot_logs = []
         self.config_status = "Not Configured"
+        self._html_head = _HTML_HEAD.encode('utf-8')
+        self._html_tail = _HTML_TAIL.encode('utf-8')
+        # The head is compressed once into a single gzip stream; each response continues a copy of
+        # that stream, since browsers stop decoding after the first of several concatenated members
+        self._html_head_deflate = zlib.compressobj(9, zlib.DEFLATED, 31)
+        self._html_head_gz = self._html_head_deflate.compress(self._html_head)
+        self._status_checked = 0.0  # time.monotonic() of the last status check
+        self._missing_keys = None  # Cached result of the API key check
+        self._status_json = b''
+        self._status_json_key = None  # (status, config, logs) that _status_json was built from
+        self.bot = BotProcess()
+        self._state_cond = threading.Condition()
+        self._state_version = 0  # Bumped whenever (bot_status, config_status) changes
+        self._last_state = None
+        self._log_signature = None  # (mtime_ns, size) of the log when bot_logs was last read
+        self._logs_html = _EMPTY_LOGS_HTML
+        self._logs_source = None  # The bot_logs list _logs_html was rendered from
         self._update_bot_status()
         
+    def is_bot_alive(self):
+        """Check whether the bot is running, through its pidfd once the process is known"""
+        return self.bot.is_running()
+    
+    def start_bot(self):
+        """Launch the bot unless it is already running; returns False if it was"""
+        return self.bot.start()
+    
+    def stop_bot(self):
+        """Stop the bot; returns True if a running bot was signalled"""
+        if self.bot.stop():
+            return True
+        
+        # Only a bot that couldn't be found in /proc needs the pattern-matching fallback
+        result = subprocess.run(['pkill', '-f', 'main.py'], capture_output=True)
+        return result.returncode == 0
+    
+    def invalidate_config(self):
+        """Re-read the API keys from the environment on the next configuration check"""
+        self._missing_keys = None
+    
+    def invalidate_status(self):
+        """Force the next status check to look at the process again"""
+        self._status_checked = 0.0
+        
     def _update_bot_status(self):
         """Update bot status by checking if the RugguardBot process is running"""
+        now = time.monotonic()
+        if now - self._status_checked < CACHE_TTL:
+            return
+        self._status_checked = now
+        
         try:
-            import subprocess
-            result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-            if result.returncode == 0:
+            self._refresh_status()
+        finally:
+            # Wake /api/events streams when the state they report has changed
+            state = (self.bot_status, self.config_status)
+            if state != self._last_state:
+                with self._state_cond:
+                    self._last_state = state
+                    self._state_version += 1
+                    self._state_cond.notify_all()
+    
+    def _refresh_status(self):
+        """Check the bot process and read its log tail"""
+        try:
+            if self.is_bot_alive():
                 self.bot_status = "Running"
-                # Try to get recent logs
+                # Try to get recent logs, skipping the read while the file is unchanged
                 try:
-                    with open('rugguard_bot.log', 'r') as f:
-                        lines = f.readlines()
-                        self.bot_logs = [line.strip() for line in lines[-20:] if line.strip()]
+                    st = os.stat('rugguard_bot.log')
+                    signature = (st.st_mtime_ns, st.st_size)
+                    if signature != self._log_signature:
+                        self.bot_logs = [line.strip() for line in _read_log_tail('rugguard_bot.log') if line.strip()]
+                        self._log_signature = signature
                 except FileNotFoundError:
                     self.bot_logs = ["Bot is running but log file not found"]
+                    self._log_signature = None
             else:
                 self.bot_status = "Stopped"
                 self.bot_logs = []
+                self._log_signature = None
         except Exception as e:
             self.bot_status = "Unknown"
             self.bot_logs = [f"Error checking status: {str(e)}"]
+            self._log_signature = None
+        
+        # Escape and join the lines once per change instead of on every page render
+        if self.bot_logs is not self._logs_source:
+            self._logs_source = self.bot_logs
+            self._logs_html = '<br>'.join(html.escape(line) for line in self.bot_logs[-20:]) or _EMPTY_LOGS_HTML
         
     def check_configuration(self):
         """Check if API keys are configured"""
-        required_keys = [
-            'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN', 
-            'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'
-        ]
-        
-        missing_keys = []
-        for key in required_keys:
-            if not os.environ.get(key):
-                missing_keys.append(key)
+        missing_keys = self._missing_keys
+        if missing_keys is None:
+            # The environment is fixed for the life of the process, so this runs once
+            env = os.environ
+            missing_keys = self._missing_keys = [key for key in _REQUIRED_KEYS if not env.get(key)]
         
         if missing_keys:
             self.config_status = f"Missing: {', '.join(missing_keys)}"
@@ -60,8 +404,27 @@ class RugguardBotServer:
             self.config_status = "Configured"
             return True
 
-    def get_dashboard_html(self):
-        """Generate dashboard HTML"""
+    def get_status_json(self):
+        """Return the /api/status body, re-serialized only when the status has changed"""
+        logs = self.bot_logs[-10:]
+        key = (self.bot_status, self.config_status, logs)
+        if key != self._status_json_key:
+            status = {
+                'status': self.bot_status,
+                'config': self.config_status,
+                'logs': logs
+            }
+            self._status_json = _dumps(status)
+            self._status_json_key = key
+        return self._status_json
+    
+    def get_dashboard_html(self, compress=False):
+        """
+        Generate dashboard HTML as UTF-8 bytes, formatting only the dynamic fragment
+        
+        Args:
+            compress: Return a gzip body; only the dynamic fragment and tail are compressed per call
+        """
         config_ok = self.check_configuration()
         self._update_bot_status()  # Update status before generating HTML
         
@@ -79,67 +442,7 @@ class RugguardBotServer:
                 'trusted_accounts': 73
             }
         
-        return f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>RugguardBot - X Account Analyzer</title>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <script>
-                tailwind.config = {{
-                    theme: {{
-                        extend: {{
-                            colors: {{
-                                'primary': '#3b82f6',
-                                'primary-dark': '#1e40af',
-                                'secondary': '#64748b',
-                                'accent': '#06b6d4',
-                                'success': '#10b981',
-                                'warning': '#f59e0b',
-                                'error': '#ef4444'
-                            }},
-                            animation: {{
-                                'pulse-slow': 'pulse 3s infinite',
-                                'bounce-slow': 'bounce 2s infinite'
-                            }}
-                        }}
-                    }}
-                }}
-            </script>
-            <link rel="preconnect" href="https://fonts.googleapis.com">
-            <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-            <style>
-                body {{ font-family: 'Inter', sans-serif; }}
-                .gradient-bg {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }}
-                .card-shadow {{ box-shadow: 0 10px 25px -5px rgba(0, 0, 0, 0.1), 0 10px 10px -5px rgba(0, 0, 0, 0.04); }}
-                .glass {{ backdrop-filter: blur(16px) saturate(180%); background-color: rgba(255, 255, 255, 0.75); border: 1px solid rgba(209, 213, 219, 0.3); }}
-                .status-indicator {{ position: relative; display: inline-block; }}
-                .status-indicator::before {{ content: ''; position: absolute; top: 50%; left: -12px; transform: translateY(-50%); width: 8px; height: 8px; border-radius: 50%; }}
-                .status-success::before {{ background-color: #10b981; box-shadow: 0 0 6px #10b981; }}
-                .status-warning::before {{ background-color: #f59e0b; box-shadow: 0 0 6px #f59e0b; }}
-                .status-error::before {{ background-color: #ef4444; box-shadow: 0 0 6px #ef4444; }}
-                .terminal {{ background: linear-gradient(145deg, #1a1a1a, #2d2d2d); color: #00ff41; font-family: 'Monaco', 'Menlo', monospace; }}
-                .metric-card {{ transition: all 0.3s ease; }}
-                .metric-card:hover {{ transform: translateY(-2px); }}
-            </style>
-        </head>
-        <body class="min-h-screen gradient-bg">
-            <div class="min-h-screen py-8 px-4">
-                <!-- Header -->
-                <div class="max-w-6xl mx-auto mb-8">
-                    <div class="text-center text-white">
-                        <div class="inline-flex items-center justify-center w-20 h-20 bg-white/20 rounded-full mb-4 backdrop-blur-lg">
-                            <span class="text-4xl">🛡️</span>
-                        </div>
-                        <h1 class="text-5xl font-bold mb-2">RugguardBot</h1>
-                        <p class="text-xl text-white/80 font-medium">Advanced X Account Trustworthiness Analyzer</p>
-                        <div class="w-24 h-1 bg-gradient-to-r from-accent to-primary mx-auto mt-4 rounded-full"></div>
-                    </div>
-                </div>
-
+        dynamic = f"""
                 <div class="max-w-6xl mx-auto grid grid-cols-1 lg:grid-cols-3 gap-6">
                     <!-- Configuration Status -->
                     <div class="lg:col-span-2">
@@ -175,7 +478,7 @@ class RugguardBotServer:
                                     <div class="{'bg-success text-white' if self.bot_status == 'Running' else 'bg-warning text-white'} w-16 h-16 rounded-full flex items-center justify-center mx-auto mb-2 {'animate-pulse-slow' if self.bot_status == 'Running' else ''}">
                                         <span class="text-2xl">{'🟢' if self.bot_status == 'Running' else '🟡'}</span>
                                     </div>
-                                    <p class="font-bold text-lg text-gray-800">{self.bot_status}</p>
+                                    <p class="font-bold text-lg text-gray-800" data-status="bot">{self.bot_status}</p>
                                     <p class="text-sm text-gray-500">{datetime.now().strftime('%H:%M:%S')}</p>
                                 </div>
                             </div>
@@ -260,42 +563,7 @@ class RugguardBotServer:
                         </div>
                     </div>
 
-                    <!-- Setup Instructions -->
-                    <div>
-                        <div class="glass rounded-2xl p-6 card-shadow">
-                            <h2 class="text-xl font-bold text-gray-800 mb-4 flex items-center">
-                                <span class="text-2xl mr-2">⚙️</span>
-                                Setup Guide
-                            </h2>
-                            <div class="space-y-4">
-                                <p class="text-gray-600">Get your X API credentials to start analyzing accounts:</p>
-                                <div class="bg-blue-50 border-l-4 border-primary p-4 rounded-lg">
-                                    <ol class="space-y-2 text-sm">
-                                        <li class="flex items-start">
-                                            <span class="bg-primary text-white w-5 h-5 rounded-full flex items-center justify-center text-xs mr-2 mt-0.5 font-bold">1</span>
-                                            <span>Visit <a href="https://developer.twitter.com" target="_blank" class="text-primary hover:text-primary-dark font-medium underline">Twitter Developer Portal</a></span>
-                                        </li>
-                                        <li class="flex items-start">
-                                            <span class="bg-primary text-white w-5 h-5 rounded-full flex items-center justify-center text-xs mr-2 mt-0.5 font-bold">2</span>
-                                            <span>Create an app and generate API keys</span>
-                                        </li>
-                                        <li class="flex items-start">
-                                            <span class="bg-primary text-white w-5 h-5 rounded-full flex items-center justify-center text-xs mr-2 mt-0.5 font-bold">3</span>
-                                            <span>Add these secrets to your Replit environment:</span>
-                                        </li>
-                                    </ol>
-                                </div>
-                                <div class="grid grid-cols-1 gap-2 text-xs">
-                                    <div class="bg-gray-100 rounded p-2 font-mono">X_API_KEY</div>
-                                    <div class="bg-gray-100 rounded p-2 font-mono">X_API_SECRET</div>
-                                    <div class="bg-gray-100 rounded p-2 font-mono">X_ACCESS_TOKEN</div>
-                                    <div class="bg-gray-100 rounded p-2 font-mono">X_ACCESS_TOKEN_SECRET</div>
-                                    <div class="bg-gray-100 rounded p-2 font-mono">X_BEARER_TOKEN</div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-
+{_SETUP_GUIDE_HTML}
                     <!-- Activity Logs -->
                     <div class="lg:col-span-3">
                         <div class="glass rounded-2xl p-6 card-shadow">
@@ -311,131 +579,27 @@ class RugguardBotServer:
                             </div>
                             <div class="terminal rounded-lg p-4 h-64 overflow-y-auto border">
                                 <div class="space-y-1 text-sm">
-                                    {'<br>'.join(self.bot_logs[-20:]) if self.bot_logs else '<div class="text-center text-green-400 py-8"><div class="text-4xl mb-2">🚀</div><div>Bot logs will appear here once started</div><div class="text-xs mt-2 opacity-70">Configure API keys and start the bot to see real-time activity</div></div>'}
+                                    {self._logs_html}
                                 </div>
                             </div>
                         </div>
                     </div>
-                </div>
-            </div>
-            
-            <script>
-                // Show toast notifications instead of alerts
-                function showToast(message, type = 'info') {{
-                    const toast = document.createElement('div');
-                    toast.className = `fixed top-4 right-4 z-50 px-6 py-3 rounded-lg shadow-lg transform transition-all duration-300 translate-x-full`;
-                    
-                    const colors = {{
-                        'success': 'bg-green-500 text-white',
-                        'error': 'bg-red-500 text-white',
-                        'info': 'bg-blue-500 text-white',
-                        'warning': 'bg-yellow-500 text-white'
-                    }};
-                    
-                    toast.className += ` ${{colors[type] || colors.info}}`;
-                    toast.textContent = message;
-                    
-                    document.body.appendChild(toast);
-                    
-                    setTimeout(() => {{
-                        toast.style.transform = 'translateX(0)';
-                    }}, 100);
-                    
-                    setTimeout(() => {{
-                        toast.style.transform = 'translateX(100%)';
-                        setTimeout(() => document.body.removeChild(toast), 300);
-                    }}, 3000);
-                }}
-
-                function startBot() {{
-                    const button = document.querySelector('[onclick="startBot()"]');
-                    const originalText = button.innerHTML;
-                    button.innerHTML = '<span class="animate-spin">⏳</span> <span>Starting...</span>';
-                    button.disabled = true;
-                    
-                    fetch('/api/start', {{method: 'POST'}})
-                        .then(r => r.json())
-                        .then(data => {{
-                            showToast(data.message, data.success !== false ? 'success' : 'error');
-                            setTimeout(refreshStatus, 1000);
-                        }})
-                        .catch(e => {{
-                            showToast('Failed to start bot: ' + e.message, 'error');
-                        }})
-                        .finally(() => {{
-                            button.innerHTML = originalText;
-                            button.disabled = false;
-                        }});
-                }}
-                
-                function stopBot() {{
-                    const button = document.querySelector('[onclick="stopBot()"]');
-                    const originalText = button.innerHTML;
-                    button.innerHTML = '<span class="animate-spin">⏳</span> <span>Stopping...</span>';
-                    button.disabled = true;
-                    
-                    fetch('/api/stop', {{method: 'POST'}})
-                        .then(r => r.json())
-                        .then(data => {{
-                            showToast(data.message, 'success');
-                            setTimeout(refreshStatus, 1000);
-                        }})
-                        .catch(e => {{
-                            showToast('Failed to stop bot: ' + e.message, 'error');
-                        }})
-                        .finally(() => {{
-                            button.innerHTML = originalText;
-                            button.disabled = false;
-                        }});
-                }}
-                
-                function refreshStatus() {{
-                    const button = document.querySelector('[onclick="refreshStatus()"]');
-                    const originalText = button.innerHTML;
-                    button.innerHTML = '<span class="animate-spin">🔄</span> <span>Refreshing...</span>';
-                    
-                    setTimeout(() => {{
-                        location.reload();
-                    }}, 500);
-                }}
-                
-                // Auto-refresh every 30 seconds
-                setInterval(() => {{
-                    fetch('/api/status')
-                        .then(r => r.json())
-                        .then(data => {{
-                            // Update status indicators without full page reload
-                            const statusElements = document.querySelectorAll('[data-status]');
-                            statusElements.forEach(el => {{
-                                if (el.dataset.status === 'bot') {{
-                                    el.textContent = data.status;
-                                }}
-                            }});
-                        }})
-                        .catch(() => {{
-                            // Silent fail for auto-refresh
-                        }});
-                }}, 30000);
-
-                // Add smooth transitions and interactions
-                document.addEventListener('DOMContentLoaded', function() {{
-                    // Add hover effects to metric cards
-                    const metricCards = document.querySelectorAll('.metric-card');
-                    metricCards.forEach(card => {{
-                        card.addEventListener('mouseenter', function() {{
-                            this.style.transform = 'translateY(-4px) scale(1.02)';
-                        }});
-                        card.addEventListener('mouseleave', function() {{
-                            this.style.transform = 'translateY(0) scale(1)';
-                        }});
-                    }});
-                }});
-            </script>
-        </body>
-        </html>
-        """
+"""
+        # One join builds the payload with a single copy, written to the socket in one call
+        if compress:
+            stream = self._html_head_deflate.copy()
+            return b''.join((
+                self._html_head_gz,
+                stream.compress(dynamic.encode('utf-8')),
+                stream.compress(self._html_tail),
+                stream.flush()
+            ))
+        return b''.join((self._html_head, dynamic.encode('utf-8'), self._html_tail))
 
-class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+class MyHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+    # Persistent connections; every response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    
     def __init__(self, *args, **kwargs):
         # Extract server_instance from kwargs before calling super()
         self.server_instance = kwargs.pop('server_instance', None)
@@ -443,56 +607,38 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     
     def do_GET(self):
         if self.path == '/':
+            compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+            body = self.server_instance.get_dashboard_html(compress)
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
+            if compress:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Content-Length', str(len(body)))
             self.end_headers()
-            html = self.server_instance.get_dashboard_html()
-            self.wfile.write(html.encode())
+            self.wfile.write(body)
         elif self.path == '/api/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            status = {
-                'status': self.server_instance.bot_status,
-                'config': self.server_instance.config_status,
-                'logs': self.server_instance.bot_logs[-10:]
-            }
-            self.wfile.write(json.dumps(status).encode())
+            self._send_json(self.server_instance.get_status_json())
+        elif self.path == '/api/events':
+            self._stream_events()
         else:
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
     
     def do_POST(self):
+        # Drain any request body so the connection can be reused
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        
         if self.path == '/api/start':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
             if self.server_instance.check_configuration():
                 try:
-                    # Try to start the bot by checking if it's already running
-                    import threading
-                    import subprocess
-                    
-                    # Check if bot is already running
-                    result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-                    if result.returncode == 0:
+                    # Start the bot unless it is already running
+                    if not self.server_instance.start_bot():
                         self.server_instance.bot_status = "Running"
                         response = {'message': 'Bot is already running', 'success': True}
                     else:
-                        # Start the bot in background
-                        def start_bot_background():
-                            try:
-                                subprocess.Popen(['python', 'main.py'], 
-                                               stdout=subprocess.DEVNULL, 
-                                               stderr=subprocess.DEVNULL)
-                            except Exception as e:
-                                print(f"Error starting bot: {e}")
-                        
-                        thread = threading.Thread(target=start_bot_background)
-                        thread.daemon = True
-                        thread.start()
-                        
+                        self.server_instance.invalidate_status()
                         self.server_instance.bot_status = "Starting..."
                         response = {'message': 'Bot startup initiated - check logs for status', 'success': True}
                         
@@ -502,18 +648,14 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             else:
                 response = {'message': 'Cannot start - API keys not configured', 'success': False}
             
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(_dumps(response))
         
         elif self.path == '/api/stop':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
             try:
-                import subprocess
                 # Try to stop the bot process
-                result = subprocess.run(['pkill', '-f', 'main.py'], capture_output=True)
-                if result.returncode == 0:
+                stopped = self.server_instance.stop_bot()
+                self.server_instance.invalidate_status()
+                if stopped:
                     self.server_instance.bot_status = "Stopped"
                     response = {'message': 'Bot stopped successfully', 'success': True}
                 else:
@@ -522,32 +664,90 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             except Exception as e:
                 response = {'message': f'Error stopping bot: {str(e)}', 'success': False}
             
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(_dumps(response))
+        else:
+            self._send_not_found()
+    
+    def _stream_events(self):
+        """Hold the connection open and push a server-sent event whenever the status changes"""
+        server = self.server_instance
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')  # The stream has no length; it ends when the socket closes
+        self.end_headers()
+        
+        server.check_configuration()
+        version = None
+        idle = 0.0
+        try:
+            while True:
+                with server._state_cond:
+                    server._state_cond.wait_for(lambda: server._state_version != version, timeout=EVENT_INTERVAL)
+                
+                if server._state_version == version:
+                    # Nothing pushed by a request meanwhile, so check the process ourselves
+                    server.check_configuration()
+                    server._update_bot_status()
+                
+                if server._state_version != version:
+                    version = server._state_version
+                    event = {'status': server.bot_status, 'config': server.config_status}
+                    self.wfile.write(b'data: ' + _dumps(event) + b'\n\n')
+                    idle = 0.0
+                else:
+                    idle += EVENT_INTERVAL
+                    if idle >= EVENT_KEEPALIVE:
+                        # A comment line; writing it is how a closed client gets noticed
+                        self.wfile.write(b': keepalive\n\n')
+                        idle = 0.0
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+    
+    def _send_json(self, body):
+        """Send a 200 response with an encoded JSON body"""
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_not_found(self):
+        """Send an empty 404 response"""
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
     
     def log_message(self, format, *args):
         # Suppress default logging
         pass
 
+class DashboardServer(socketserver.ThreadingTCPServer):
+    """TCP server that handles each request on its own thread, so slow requests don't queue others"""
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 64
+
 def run_server():
     """Start the web server"""
-    import socket
-    
-    # Find an available port
-    PORT = 5000
-    while PORT < 5010:
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('0.0.0.0', PORT))
-                break
-        except OSError:
-            PORT += 1
-    
-    server_instance = RugguardBotServer(PORT)
+    server_instance = RugguardBotServer()
     
     def handler(*args, **kwargs):
         return MyHTTPRequestHandler(*args, server_instance=server_instance, **kwargs)
     
-    with socketserver.TCPServer(("0.0.0.0", PORT), handler) as httpd:
+    # Bind the server itself to the first free port, rather than probing each with a throwaway socket
+    for PORT in range(5000, 5010):
+        try:
+            httpd = DashboardServer(("0.0.0.0", PORT), handler)
+            break
+        except OSError:
+            continue
+    else:
+        raise OSError("No free port between 5000 and 5009")
+    server_instance.port = PORT
+    
+    with httpd:
         print(f"🚀 RugguardBot Dashboard running at http://0.0.0.0:{PORT}")
         print("📝 Configure your X API keys in Replit Secrets to get started")
         httpd.serve_forever()
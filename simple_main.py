@@ -10,35 +10,30 @@ import subprocess
 import json
 from datetime import datetime
 
-# Simple WSGI application class
-class RugguardBotWSGI:
-    def __init__(self):
-        self.routes = {
-            '/': self.dashboard,
-            '/api/status': self.api_status,
-            '/api/start': self.api_start,
-            '/api/stop': self.api_stop,
-        }
-    
-    def __call__(self, environ, start_response):
-        path = environ.get('PATH_INFO', '/')
-        method = environ.get('REQUEST_METHOD', 'GET')
-        
-        if path in self.routes:
-            return self.routes[path](environ, start_response)
-        else:
-            return self.not_found(environ, start_response)
-    
-    def dashboard(self, environ, start_response):
-        status = '200 OK'
-        headers = [('Content-Type', 'text/html; charset=utf-8')]
-        start_response(status, headers)
-        
-        # Check bot status
-        bot_status = self.check_bot_status()
-        config_status = self.check_configuration()
-        
-        html = f"""
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON responses; the json module is used without it
+    orjson = None
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # Optional: config reloads re-read .env only when it is installed
+    load_dotenv = None
+
+from bot_process import BotProcess
+
+def _dumps(data):
+    """Serialize a response payload to JSON bytes"""
+    return orjson.dumps(data) if orjson else json.dumps(data).encode()
+
+# API keys the bot needs before it can be started
+_REQUIRED_KEYS = (
+    'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN',
+    'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'
+)
+
+# Static parts of the dashboard page, encoded once at import
+_DASHBOARD_HEAD = """
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -46,18 +41,18 @@ class RugguardBotWSGI:
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>RugguardBot - X Account Analyzer</title>
             <style>
-                body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; }}
-                .header {{ text-align: center; margin-bottom: 30px; }}
-                .header h1 {{ color: #2563eb; margin-bottom: 10px; }}
-                .card {{ background: white; padding: 20px; margin: 20px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-                .status {{ font-size: 1.2em; font-weight: bold; padding: 10px; border-radius: 4px; }}
-                .status.running {{ background: #dcfce7; color: #166534; }}
-                .status.stopped {{ background: #fef2f2; color: #dc2626; }}
-                .btn {{ padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; margin: 5px; }}
-                .btn-success {{ background: #10b981; color: white; }}
-                .btn-danger {{ background: #ef4444; color: white; }}
-                .btn:hover {{ opacity: 0.9; }}
+                body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }
+                .container { max-width: 800px; margin: 0 auto; }
+                .header { text-align: center; margin-bottom: 30px; }
+                .header h1 { color: #2563eb; margin-bottom: 10px; }
+                .card { background: white; padding: 20px; margin: 20px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+                .status { font-size: 1.2em; font-weight: bold; padding: 10px; border-radius: 4px; }
+                .status.running { background: #dcfce7; color: #166534; }
+                .status.stopped { background: #fef2f2; color: #dc2626; }
+                .btn { padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; margin: 5px; }
+                .btn-success { background: #10b981; color: white; }
+                .btn-danger { background: #ef4444; color: white; }
+                .btn:hover { opacity: 0.9; }
             </style>
         </head>
         <body>
@@ -69,8 +64,9 @@ class RugguardBotWSGI:
                 
                 <div class="card">
                     <h3>Bot Status</h3>
-                    <div class="status {bot_status.lower()}">{bot_status}</div>
-                    <p>Configuration: {config_status}</p>
+""".encode('utf-8')
+
+_DASHBOARD_TAIL = """
                     <button class="btn btn-success" onclick="startBot()">Start Bot</button>
                     <button class="btn btn-danger" onclick="stopBot()">Stop Bot</button>
                 </div>
@@ -99,109 +95,164 @@ class RugguardBotWSGI:
             </div>
             
             <script>
-                async function startBot() {{
-                    try {{
-                        const response = await fetch('/api/start', {{ method: 'POST' }});
+                async function startBot() {
+                    try {
+                        const response = await fetch('/api/start', { method: 'POST' });
                         const data = await response.json();
                         alert(data.message);
                         if (data.success) setTimeout(() => location.reload(), 2000);
-                    }} catch (error) {{
+                    } catch (error) {
                         alert('Error: ' + error.message);
-                    }}
-                }}
+                    }
+                }
                 
-                async function stopBot() {{
-                    try {{
-                        const response = await fetch('/api/stop', {{ method: 'POST' }});
+                async function stopBot() {
+                    try {
+                        const response = await fetch('/api/stop', { method: 'POST' });
                         const data = await response.json();
                         alert(data.message);
                         if (data.success) setTimeout(() => location.reload(), 2000);
-                    }} catch (error) {{
+                    } catch (error) {
                         alert('Error: ' + error.message);
-                    }}
-                }}
+                    }
+                }
             </script>
         </body>
         </html>
-        """
-        return [html.encode('utf-8')]
+        """.encode('utf-8')
+
+# Per-request part of the page
+_STATUS_CARD = """
+                    <div class="status {status_class}">{status}</div>
+                    <p>Configuration: {config}</p>
+"""
+
+# Response headers and error bodies shared by every request. Servers may add to the
+# header list passed to start_response, so handlers pass a fresh list built from these
+_HTML_HEADERS = (('Content-Type', 'text/html; charset=utf-8'),)
+_JSON_HEADERS = (('Content-Type', 'application/json'),)
+_NOT_FOUND_BODY = b'<h1>404 Not Found</h1>'
+_NOT_FOUND_HEADERS = (('Content-Type', 'text/html'), ('Content-Length', str(len(_NOT_FOUND_BODY))))
+_405_BODY = b'<h1>405 Method Not Allowed</h1>'
+_405_HEADERS = (('Content-Type', 'text/html'), ('Content-Length', str(len(_405_BODY))))
+
+# Simple WSGI application class
+class RugguardBotWSGI:
+    def __init__(self):
+        self.routes = {
+            '/': self.dashboard,
+            '/api/status': self.api_status,
+            '/api/start': self.api_start,
+            '/api/stop': self.api_stop,
+            '/api/reload-config': self.api_reload_config,
+        }
+        self.bot = BotProcess()
+        
+        # The environment only changes on an explicit reload, so the check is cached until then
+        self._config_version = 0
+        self._config_cache = None  # (version, (ok, status))
     
-    def api_status(self, environ, start_response):
-        status = '200 OK'
-        headers = [('Content-Type', 'application/json')]
-        start_response(status, headers)
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '/')
+        method = environ.get('REQUEST_METHOD', 'GET')
+        
+        if path in self.routes:
+            return self.routes[path](environ, start_response)
+        else:
+            return self.not_found(environ, start_response)
+    
+    def dashboard(self, environ, start_response):
+        # Check bot status
+        bot_status = self.check_bot_status()
+        _, config_status = self.check_configuration()
         
+        body = _STATUS_CARD.format(status_class=bot_status.lower(), status=bot_status, config=config_status).encode('utf-8')
+        
+        # The shared head and tail go out as their own chunks rather than copied into one buffer
+        length = len(_DASHBOARD_HEAD) + len(body) + len(_DASHBOARD_TAIL)
+        start_response('200 OK', [*_HTML_HEADERS, ('Content-Length', str(length))])
+        return [_DASHBOARD_HEAD, body, _DASHBOARD_TAIL]
+    
+    def api_status(self, environ, start_response):
         bot_status = self.check_bot_status()
-        config_status = self.check_configuration()
+        _, config_status = self.check_configuration()
         
         response = {
             'status': bot_status,
             'config': config_status,
             'timestamp': datetime.now().isoformat()
         }
-        return [json.dumps(response).encode('utf-8')]
+        return self.json_response(start_response, response)
     
     def api_start(self, environ, start_response):
         if environ.get('REQUEST_METHOD') != 'POST':
             return self.method_not_allowed(environ, start_response)
         
-        status = '200 OK'
-        headers = [('Content-Type', 'application/json')]
-        start_response(status, headers)
-        
         try:
-            # Check if bot is already running
-            result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-            if result.returncode == 0:
-                response = {'message': 'Bot is already running', 'success': True}
-            else:
-                # Start the bot
-                subprocess.Popen(['python', 'main.py'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # Start the bot unless it is already running
+            if self.bot.start():
                 response = {'message': 'Bot startup initiated', 'success': True}
+            else:
+                response = {'message': 'Bot is already running', 'success': True}
         except Exception as e:
             response = {'message': f'Error starting bot: {str(e)}', 'success': False}
         
-        return [json.dumps(response).encode('utf-8')]
+        return self.json_response(start_response, response)
     
     def api_stop(self, environ, start_response):
         if environ.get('REQUEST_METHOD') != 'POST':
             return self.method_not_allowed(environ, start_response)
         
-        status = '200 OK'
-        headers = [('Content-Type', 'application/json')]
-        start_response(status, headers)
-        
         try:
-            subprocess.run(['pkill', '-f', 'main.py'], capture_output=True, text=True)
+            if not self.bot.stop():
+                # Not started or found by this dashboard
+                subprocess.run(['pkill', '-f', 'main.py'], capture_output=True, text=True)
             response = {'message': 'Bot stop signal sent', 'success': True}
         except Exception as e:
             response = {'message': f'Error stopping bot: {str(e)}', 'success': False}
         
-        return [json.dumps(response).encode('utf-8')]
+        return self.json_response(start_response, response)
+    
+    def api_reload_config(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') != 'POST':
+            return self.method_not_allowed(environ, start_response)
+        
+        # Pick up edits to .env and recheck
+        if load_dotenv:
+            load_dotenv(override=True)
+        self._config_version += 1
+        ok, config_status = self.check_configuration()
+        
+        response = {'message': 'Configuration reloaded', 'success': ok, 'config': config_status}
+        return self.json_response(start_response, response)
+    
+    def json_response(self, start_response, response):
+        body = _dumps(response)
+        start_response('200 OK', [*_JSON_HEADERS, ('Content-Length', str(len(body)))])
+        return [body]
     
     def not_found(self, environ, start_response):
-        status = '404 Not Found'
-        headers = [('Content-Type', 'text/html')]
-        start_response(status, headers)
-        return [b'<h1>404 Not Found</h1>']
+        start_response('404 Not Found', list(_NOT_FOUND_HEADERS))
+        return [_NOT_FOUND_BODY]
     
     def method_not_allowed(self, environ, start_response):
-        status = '405 Method Not Allowed'
-        headers = [('Content-Type', 'text/html')]
-        start_response(status, headers)
-        return [b'<h1>405 Method Not Allowed</h1>']
+        start_response('405 Method Not Allowed', list(_405_HEADERS))
+        return [_405_BODY]
     
     def check_bot_status(self):
         try:
-            result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-            return "Running" if result.returncode == 0 else "Stopped"
+            return "Running" if self.bot.is_running() else "Stopped"
         except:
             return "Unknown"
     
     def check_configuration(self):
-        required_keys = ['X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN', 'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN']
-        missing = [key for key in required_keys if not os.environ.get(key)]
-        return "Complete" if not missing else f"Missing: {{', '.join(missing)}}"
+        cached = self._config_cache
+        if cached is None or cached[0] != self._config_version:
+            env_get = os.environ.get
+            missing = [key for key in _REQUIRED_KEYS if not env_get(key)]
+            result = (not missing, "Complete" if not missing else f"Missing: {', '.join(missing)}")
+            cached = self._config_cache = (self._config_version, result)
+        return cached[1]
 
 # Create the WSGI application instance
 app = RugguardBotWSGI()
@@ -0,0 +1,57 @@
+async function startBot() {
+    try {
+        const response = await fetch('/api/start', { method: 'POST' });
+        const data = await response.json();
+        alert(data.message);
+        if (data.success) {
+            setTimeout(() => window.location.reload(), 2000);
+        }
+    } catch (error) {
+        alert('Error starting bot: ' + error.message);
+    }
+}
+
+async function stopBot() {
+    try {
+        const response = await fetch('/api/stop', { method: 'POST' });
+        const data = await response.json();
+        alert(data.message);
+        if (data.success) {
+            setTimeout(() => window.location.reload(), 2000);
+        }
+    } catch (error) {
+        alert('Error stopping bot: ' + error.message);
+    }
+}
+
+function refreshLogs() {
+    window.location.reload();
+}
+
+// The server pushes status changes; poll with backoff only where EventSource is unavailable
+let lastStatus = null;
+let pollDelay = 5000;
+function pollStatus() {
+    fetch('/api/status')
+        .then(response => response.json())
+        .then(data => {
+            console.log('Status updated:', data.status);
+            pollDelay = data.status === lastStatus ? Math.min(pollDelay * 2, 300000) : 5000;
+            lastStatus = data.status;
+        })
+        .catch(error => {
+            console.error('Status update failed:', error);
+            pollDelay = Math.min(pollDelay * 2, 300000);
+        })
+        .finally(() => setTimeout(pollStatus, pollDelay));
+}
+if (window.EventSource) {
+    const statusStream = new EventSource('/api/status/stream');
+    statusStream.onmessage = event => {
+        const data = JSON.parse(event.data);
+        console.log('Status updated:', data.status);
+    };
+    statusStream.onerror = () => console.error('Status stream interrupted, reconnecting');
+} else {
+    setTimeout(pollStatus, pollDelay);
+}
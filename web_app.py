@@ -6,14 +6,174 @@ Lightweight web interface using built-in Python HTTP server
 
 import os
 import json
+import collections
 import threading
 import subprocess
 import time
+from concurrent.futures import Future
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 import http.server
 import socketserver
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON responses; the json module is used without it
+    orjson = None
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # Optional: config reloads re-read .env only when it is installed
+    load_dotenv = None
+
+from bot_process import BotProcess
+
+def _dumps(data):
+    """Serialize a response payload to JSON bytes"""
+    return orjson.dumps(data) if orjson else json.dumps(data).encode()
+
+# How long polled dashboard data is reused, in milliseconds
+STATUS_TTL_MS = 2000
+STATS_TTL_MS = 30000
+CONFIG_TTL_MS = 60000
+
+# Seconds between status checks on an /api/events stream, and between its keepalives
+EVENT_INTERVAL = 5.0
+EVENT_KEEPALIVE = 30.0
+
+# API keys the bot needs before it can be started
+_REQUIRED_KEYS = (
+    'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN',
+    'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'
+)
+
+LOG_FILE = 'rugguard_bot.log'
+LOG_TAIL_LINES = 20
+
+# Static parts of the dashboard page, built and encoded once instead of per request
+_DASHBOARD_HEAD = """
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>RugguardBot - X Account Analyzer</title>
+            <style>
+                * { margin: 0; padding: 0; box-sizing: border-box; }
+                body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f5f5f5; color: #333; }
+                .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
+                .header { text-align: center; margin-bottom: 40px; }
+                .header h1 { font-size: 2.5rem; color: #2563eb; margin-bottom: 8px; }
+                .header p { font-size: 1.2rem; color: #64748b; }
+                .cards { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin-bottom: 30px; }
+                .card { background: white; padding: 24px; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
+                .card h3 { font-size: 1.1rem; margin-bottom: 16px; display: flex; align-items: center; justify-content: space-between; }
+                .status-dot { width: 12px; height: 12px; border-radius: 50%; }
+                .status-green { background: #10b981; }
+                .status-red { background: #ef4444; }
+                .status-orange { background: #f59e0b; }
+                .status-text { font-size: 1.5rem; font-weight: bold; margin-bottom: 16px; }
+                .text-green { color: #10b981; }
+                .text-red { color: #ef4444; }
+                .text-orange { color: #f59e0b; }
+                .btn { padding: 10px 20px; border: none; border-radius: 6px; cursor: pointer; font-size: 0.9rem; font-weight: 500; }
+                .btn-green { background: #10b981; color: white; }
+                .btn-red { background: #ef4444; color: white; }
+                .btn-blue { background: #2563eb; color: white; }
+                .btn:hover { opacity: 0.9; }
+                .btn:disabled { background: #9ca3af; cursor: not-allowed; }
+                .stats { display: flex; flex-direction: column; gap: 8px; }
+                .stat-row { display: flex; justify-content: space-between; }
+                .logs { background: #f8f9fa; padding: 16px; border-radius: 8px; max-height: 300px; overflow-y: auto; margin-bottom: 16px; }
+                .log-entry { font-family: 'Courier New', monospace; font-size: 0.85rem; margin-bottom: 4px; color: #374151; }
+                .how-it-works { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; text-align: center; }
+                .step { padding: 20px; }
+                .step-icon { font-size: 2rem; margin-bottom: 12px; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>🛡️ RugguardBot</h1>
+                    <p>X Account Trustworthiness Analyzer</p>
+                </div>
+
+                <div class="cards">
+""".encode('utf-8')
+
+_DASHBOARD_TAIL = """
+                <div class="card">
+                    <h3>How It Works</h3>
+                    <div class="how-it-works">
+                        <div class="step">
+                            <div class="step-icon">👀</div>
+                            <p><strong>Monitors X/Twitter</strong><br>Watches for "riddle me this" replies</p>
+                        </div>
+                        <div class="step">
+                            <div class="step-icon">🔍</div>
+                            <p><strong>Analyzes Accounts</strong><br>Checks trustworthiness indicators</p>
+                        </div>
+                        <div class="step">
+                            <div class="step-icon">📊</div>
+                            <p><strong>Provides Report</strong><br>Replies with detailed analysis</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <script>
+                async function startBot() {
+                    try {
+                        const response = await fetch('/api/start', { method: 'POST' });
+                        const data = await response.json();
+                        alert(data.message);
+                        if (data.success) {
+                            setTimeout(() => window.location.reload(), 2000);
+                        }
+                    } catch (error) {
+                        alert('Error starting bot: ' + error.message);
+                    }
+                }
+
+                async function stopBot() {
+                    try {
+                        const response = await fetch('/api/stop', { method: 'POST' });
+                        const data = await response.json();
+                        alert(data.message);
+                        if (data.success) {
+                            setTimeout(() => window.location.reload(), 2000);
+                        }
+                    } catch (error) {
+                        alert('Error stopping bot: ' + error.message);
+                    }
+                }
+
+                function refreshLogs() {
+                    window.location.reload();
+                }
+
+                // Reload when the server pushes a status other than the one shown; poll only without EventSource
+                function checkStatus(data) {
+                    if (data.status !== document.querySelector('.status-text').textContent) {
+                        window.location.reload();
+                    }
+                }
+
+                if (window.EventSource) {
+                    new EventSource('/api/events').onmessage = e => checkStatus(JSON.parse(e.data));
+                } else {
+                    setInterval(() => {
+                        fetch('/api/status')
+                            .then(response => response.json())
+                            .then(checkStatus)
+                            .catch(error => console.error('Status update failed:', error));
+                    }, 30000);
+                }
+            </script>
+        </body>
+        </html>
+        """.encode('utf-8')
+
 # Global server instance
 server_instance = None
 
@@ -23,19 +183,63 @@ class RugguardBotServer:
         self.bot_status = "Stopped"
         self.bot_logs = []
         self.config_status = "Not Configured"
+        self.bot = BotProcess()
+        self._cache = {}  # key -> (fetched_at_ns, value)
+        self._inflight = {}  # key -> Future of the fetch in progress
+        self._refresh_lock = threading.Lock()
+        
+        # Incremental log tail: only bytes appended since the last read are parsed
+        self._log_inode = None
+        self._log_pos = 0
+        self._log_skip_partial = False
+        self._log_tail = collections.deque(maxlen=LOG_TAIL_LINES)
+        
         self.update_status()
+    
+    def _cached(self, key, ttl_ms, fn):
+        """
+        Return fn()'s result, reusing it for ttl_ms after it was fetched
+        
+        Concurrent callers that find the entry stale share a single call to fn.
+        """
+        entry = self._cache.get(key)
+        if entry and time.monotonic_ns() - entry[0] < ttl_ms * 1_000_000:
+            return entry[1]
+        
+        with self._refresh_lock:
+            entry = self._cache.get(key)
+            if entry and time.monotonic_ns() - entry[0] < ttl_ms * 1_000_000:
+                return entry[1]  # Refreshed while we waited for the lock
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            value = fn()
+            # Stamp after the call so a slow fetch doesn't eat into the TTL
+            self._cache[key] = (time.monotonic_ns(), value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._refresh_lock:
+                del self._inflight[key]
         
     def update_status(self):
         """Update bot status by checking if the RugguardBot process is running"""
         try:
-            result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-            if result.returncode == 0:
+            if self.bot.is_running():
                 self.bot_status = "Running"
                 # Try to get recent logs
                 try:
-                    with open('rugguard_bot.log', 'r') as f:
-                        lines = f.readlines()
-                        self.bot_logs = [line.strip() for line in lines[-20:] if line.strip()]
+                    self._read_new_log_lines()
+                    self.bot_logs = list(self._log_tail)
                 except FileNotFoundError:
                     self.bot_logs = ["Bot is running but log file not found"]
             else:
@@ -45,17 +249,42 @@ class RugguardBotServer:
             self.bot_status = "Unknown"
             self.bot_logs = [f"Error checking status: {str(e)}"]
         
+    def _read_new_log_lines(self):
+        """Append lines written to the log since the last call to the tail"""
+        st = os.stat(LOG_FILE)
+        if st.st_ino != self._log_inode or st.st_size < self._log_pos:
+            # New or rotated/truncated file: start again near its end
+            self._log_inode = st.st_ino
+            self._log_pos = max(0, st.st_size - 4096)
+            self._log_tail.clear()
+            self._log_skip_partial = self._log_pos > 0
+        
+        if st.st_size <= self._log_pos:
+            return
+        
+        with open(LOG_FILE, 'rb') as f:
+            f.seek(self._log_pos)
+            data = f.read(st.st_size - self._log_pos)
+        
+        # Leave an unfinished last line for the next read
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return
+        self._log_pos += end
+        
+        lines = data[:end].splitlines()
+        if self._log_skip_partial:
+            lines = lines[1:]  # Started mid-line
+            self._log_skip_partial = False
+        for line in lines:
+            line = line.decode('utf-8', 'replace').strip()
+            if line:
+                self._log_tail.append(line)
+    
     def check_configuration(self):
         """Check if API keys are configured"""
-        required_keys = [
-            'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN', 
-            'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'
-        ]
-        
-        missing_keys = []
-        for key in required_keys:
-            if not os.environ.get(key):
-                missing_keys.append(key)
+        env_get = os.environ.get
+        missing_keys = [key for key in _REQUIRED_KEYS if not env_get(key)]
         
         if missing_keys:
             self.config_status = f"Missing: {', '.join(missing_keys)}"
@@ -79,62 +308,16 @@ class RugguardBotServer:
             }
 
     def get_dashboard_html(self):
-        """Generate dashboard HTML"""
-        config_ok = self.check_configuration()
-        self.update_status()
-        db_stats = self.get_database_stats()
+        """Generate the dashboard page as UTF-8 chunks: static head, cards, static tail"""
+        config_ok = self._cached('config', CONFIG_TTL_MS, self.check_configuration)
+        self._cached('status', STATUS_TTL_MS, self.update_status)
+        db_stats = self._cached('db_stats', STATS_TTL_MS, self.get_database_stats)
         
         status_color = 'green' if self.bot_status == 'Running' else 'red' if self.bot_status == 'Stopped' else 'orange'
         config_color = 'green' if config_ok else 'red'
         
-        return f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>RugguardBot - X Account Analyzer</title>
-            <style>
-                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f5f5f5; color: #333; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                .header {{ text-align: center; margin-bottom: 40px; }}
-                .header h1 {{ font-size: 2.5rem; color: #2563eb; margin-bottom: 8px; }}
-                .header p {{ font-size: 1.2rem; color: #64748b; }}
-                .cards {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-                .card {{ background: white; padding: 24px; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }}
-                .card h3 {{ font-size: 1.1rem; margin-bottom: 16px; display: flex; align-items: center; justify-content: space-between; }}
-                .status-dot {{ width: 12px; height: 12px; border-radius: 50%; }}
-                .status-green {{ background: #10b981; }}
-                .status-red {{ background: #ef4444; }}
-                .status-orange {{ background: #f59e0b; }}
-                .status-text {{ font-size: 1.5rem; font-weight: bold; margin-bottom: 16px; }}
-                .text-green {{ color: #10b981; }}
-                .text-red {{ color: #ef4444; }}
-                .text-orange {{ color: #f59e0b; }}
-                .btn {{ padding: 10px 20px; border: none; border-radius: 6px; cursor: pointer; font-size: 0.9rem; font-weight: 500; }}
-                .btn-green {{ background: #10b981; color: white; }}
-                .btn-red {{ background: #ef4444; color: white; }}
-                .btn-blue {{ background: #2563eb; color: white; }}
-                .btn:hover {{ opacity: 0.9; }}
-                .btn:disabled {{ background: #9ca3af; cursor: not-allowed; }}
-                .stats {{ display: flex; flex-direction: column; gap: 8px; }}
-                .stat-row {{ display: flex; justify-content: space-between; }}
-                .logs {{ background: #f8f9fa; padding: 16px; border-radius: 8px; max-height: 300px; overflow-y: auto; margin-bottom: 16px; }}
-                .log-entry {{ font-family: 'Courier New', monospace; font-size: 0.85rem; margin-bottom: 4px; color: #374151; }}
-                .how-it-works {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; text-align: center; }}
-                .step {{ padding: 20px; }}
-                .step-icon {{ font-size: 2rem; margin-bottom: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🛡️ RugguardBot</h1>
-                    <p>X Account Trustworthiness Analyzer</p>
-                </div>
-
-                <div class="cards">
+        # Only the cards carry per-request values
+        cards = f"""
                     <div class="card">
                         <h3>Bot Status <div class="status-dot status-{status_color}"></div></h3>
                         <div class="status-text text-{status_color}">{self.bot_status}</div>
@@ -175,93 +358,73 @@ class RugguardBotServer:
                     </div>
                     <button class="btn btn-blue" onclick="refreshLogs()">Refresh Logs</button>
                 </div>
-
-                <div class="card">
-                    <h3>How It Works</h3>
-                    <div class="how-it-works">
-                        <div class="step">
-                            <div class="step-icon">👀</div>
-                            <p><strong>Monitors X/Twitter</strong><br>Watches for "riddle me this" replies</p>
-                        </div>
-                        <div class="step">
-                            <div class="step-icon">🔍</div>
-                            <p><strong>Analyzes Accounts</strong><br>Checks trustworthiness indicators</p>
-                        </div>
-                        <div class="step">
-                            <div class="step-icon">📊</div>
-                            <p><strong>Provides Report</strong><br>Replies with detailed analysis</p>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <script>
-                async function startBot() {{
-                    try {{
-                        const response = await fetch('/api/start', {{ method: 'POST' }});
-                        const data = await response.json();
-                        alert(data.message);
-                        if (data.success) {{
-                            setTimeout(() => window.location.reload(), 2000);
-                        }}
-                    }} catch (error) {{
-                        alert('Error starting bot: ' + error.message);
-                    }}
-                }}
-
-                async function stopBot() {{
-                    try {{
-                        const response = await fetch('/api/stop', {{ method: 'POST' }});
-                        const data = await response.json();
-                        alert(data.message);
-                        if (data.success) {{
-                            setTimeout(() => window.location.reload(), 2000);
-                        }}
-                    }} catch (error) {{
-                        alert('Error stopping bot: ' + error.message);
-                    }}
-                }}
-
-                function refreshLogs() {{
-                    window.location.reload();
-                }}
-
-                // Auto-refresh every 30 seconds
-                setInterval(() => {{
-                    fetch('/api/status')
-                        .then(response => response.json())
-                        .then(data => console.log('Status updated:', data.status))
-                        .catch(error => console.error('Status update failed:', error));
-                }}, 30000);
-            </script>
-        </body>
-        </html>
-        """
+"""
+        return _DASHBOARD_HEAD, cards.encode('utf-8'), _DASHBOARD_TAIL
 
 class RequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Send small JSON responses immediately instead of waiting on Nagle's algorithm
+    disable_nagle_algorithm = True
+    
     def do_GET(self):
         global server_instance
         if self.path == '/':
+            chunks = server_instance.get_dashboard_html()
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
+            self.send_header('Content-Length', str(sum(map(len, chunks))))
             self.end_headers()
-            html = server_instance.get_dashboard_html()
-            self.wfile.write(html.encode())
+            for chunk in chunks:
+                self.wfile.write(chunk)
         elif self.path == '/api/status':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
-            server_instance.update_status()
+            server_instance._cached('status', STATUS_TTL_MS, server_instance.update_status)
             status = {
                 'status': server_instance.bot_status,
                 'config': server_instance.config_status,
                 'logs': server_instance.bot_logs[-10:]
             }
-            self.wfile.write(json.dumps(status).encode())
+            self.wfile.write(_dumps(status))
+        elif self.path == '/api/events':
+            self._stream_events()
         else:
             self.send_response(404)
             self.end_headers()
     
+    def _stream_events(self):
+        """Hold the connection open and push a server-sent event whenever the status changes"""
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        
+        last_state = None
+        idle = 0.0
+        try:
+            while True:
+                server_instance._cached('config', CONFIG_TTL_MS, server_instance.check_configuration)
+                server_instance._cached('status', STATUS_TTL_MS, server_instance.update_status)
+                state = (server_instance.bot_status, server_instance.config_status)
+                if state != last_state:
+                    last_state = state
+                    event = {'status': state[0], 'config': state[1]}
+                    self.wfile.write(b'data: ' + _dumps(event) + b'\n\n')
+                    idle = 0.0
+                elif idle >= EVENT_KEEPALIVE:
+                    # A comment line; writing it is how a closed client gets noticed
+                    self.wfile.write(b': keepalive\n\n')
+                    idle = 0.0
+                self.wfile.flush()
+                
+                # Wakes the moment the bot exits or is started from this dashboard
+                started = time.monotonic()
+                if server_instance.bot.wait_for_change(EVENT_INTERVAL):
+                    server_instance._cache.pop('status', None)
+                idle += time.monotonic() - started
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+    
     def do_POST(self):
         global server_instance
         content_length = int(self.headers.get('Content-Length', 0))
@@ -272,25 +435,18 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
             self.send_header('Content-type', 'application/json')
             self.end_headers()
             
-            if server_instance.check_configuration():
+            if server_instance._cached('config', CONFIG_TTL_MS, server_instance.check_configuration):
                 try:
-                    result = subprocess.run(['pgrep', '-f', 'main.py'], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        response = {'message': 'Bot is already running', 'success': True}
-                    else:
-                        def start_bot():
-                            subprocess.Popen(['python', 'main.py'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                        
-                        thread = threading.Thread(target=start_bot)
-                        thread.daemon = True
-                        thread.start()
+                    if server_instance.bot.start():
                         response = {'message': 'Bot startup initiated - check logs for status', 'success': True}
+                    else:
+                        response = {'message': 'Bot is already running', 'success': True}
                 except Exception as e:
                     response = {'message': f'Error starting bot: {str(e)}', 'success': False}
             else:
                 response = {'message': 'Configuration incomplete. Please set API keys in Replit Secrets.', 'success': False}
             
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(_dumps(response))
             
         elif self.path == '/api/stop':
             self.send_response(200)
@@ -298,12 +454,28 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
             self.end_headers()
             
             try:
-                subprocess.run(['pkill', '-f', 'main.py'], capture_output=True, text=True)
+                if not server_instance.bot.stop():
+                    # Not started or found by this dashboard
+                    subprocess.run(['pkill', '-f', 'main.py'], capture_output=True, text=True)
                 response = {'message': 'Bot stop signal sent', 'success': True}
             except Exception as e:
                 response = {'message': f'Error stopping bot: {str(e)}', 'success': False}
             
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(_dumps(response))
+            
+        elif self.path == '/api/reload-config':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            # Pick up edits to .env and drop the cached check
+            if load_dotenv:
+                load_dotenv(override=True)
+            server_instance._cache.pop('config', None)
+            config_ok = server_instance._cached('config', CONFIG_TTL_MS, server_instance.check_configuration)
+            
+            response = {'message': 'Configuration reloaded', 'success': config_ok, 'config': server_instance.config_status}
+            self.wfile.write(_dumps(response))
         else:
             self.send_response(404)
             self.end_headers()
@@ -312,6 +484,13 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
         # Suppress default logging
         pass
 
+class DashboardServer(socketserver.ThreadingTCPServer):
+    """TCP server that handles each request on its own thread, so slow requests don't queue others"""
+    allow_reuse_address = True
+    # Dashboard instances on the same port share it, with the kernel balancing connections
+    allow_reuse_port = True
+    daemon_threads = True
+
 def run_server():
     global server_instance
     server_instance = RugguardBotServer(port=5000)
@@ -321,8 +500,7 @@ def run_server():
     
     for port in ports_to_try:
         try:
-            with socketserver.TCPServer(("0.0.0.0", port), RequestHandler) as httpd:
-                httpd.allow_reuse_address = True
+            with DashboardServer(("0.0.0.0", port), RequestHandler) as httpd:
                 print(f"🚀 RugguardBot Dashboard running at http://0.0.0.0:{port}")
                 print("📝 Configure your X API keys in Replit Secrets to get started")
                 httpd.serve_forever()